@@ -11,6 +11,7 @@ Main functions:
 - convert_to_m4b: Convert a single audio file to M4B format
 - convert_all_to_m4b: Batch convert multiple audio files to M4B format
 - combine_m4b_files: Combine multiple M4B files into one with chapters
+- combine_many: Combine several books, one per CSV file, in parallel
 - split_m4b_file: Split an M4B file by chapters into various formats
 - split_multiple_m4b_files: Split multiple M4B files by chapters
 - generate_csv_from_folder: Generate CSV template from M4B files in a folder
@@ -19,19 +20,41 @@ Main functions:
 __version__ = "1.0.0"
 __author__ = "M4B Tools Contributors"
 
-# Import main functions for API access
-from .converter import convert_to_m4b, convert_all_to_m4b
-from .combiner import combine_m4b_files, generate_csv_from_folder
-from .splitter import split_m4b_file, split_multiple_m4b_files
-from .utils import check_ffmpeg, format_time
+# Main functions for API access, imported on first use so that the CLI only
+# loads the modules needed by the command being run
+_LAZY_IMPORTS = {
+    "convert_to_m4b": "converter",
+    "convert_all_to_m4b": "converter",
+    "combine_m4b_files": "combiner",
+    "combine_many": "combiner",
+    "generate_csv_from_folder": "combiner",
+    "split_m4b_file": "splitter",
+    "split_multiple_m4b_files": "splitter",
+    "check_ffmpeg": "utils",
+    "format_time": "utils",
+}
 
 __all__ = [
     "convert_to_m4b",
     "convert_all_to_m4b", 
     "combine_m4b_files",
+    "combine_many",
     "split_m4b_file",
     "split_multiple_m4b_files",
     "generate_csv_from_folder",
     "check_ffmpeg",
     "format_time",
-]
\ No newline at end of file
+]
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        import importlib
+        module = importlib.import_module(f".{_LAZY_IMPORTS[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -12,9 +12,113 @@ import logging
 import sys
 
 from . import __version__
-from .converter import convert_all_to_m4b
-from .combiner import combine_m4b_files, generate_csv_from_folder
-from .splitter import split_multiple_m4b_files
+
+
+# Help epilogs, kept out of create_parser so the parser setup stays readable
+_MAIN_EPILOG = """
+Examples:
+  # Convert audio files to M4B
+  m4b-tools convert "**/*.mp3" ./output
+  m4b-tools convert "books/**/*.flac" ./converted -p -j 4
+  
+  # Generate CSV template for combining
+  m4b-tools generate-csv ./m4b_files
+  m4b-tools generate-csv "audiobooks/*"
+  
+  # Combine M4B files using pattern
+  m4b-tools combine "*.m4b" output.m4b --title "My Book"
+  
+  # Combine M4B files using CSV
+  m4b-tools combine --csv book_files.csv
+  
+  # Split M4B files by chapters
+  m4b-tools split "*.m4b" ./output_dir
+  
+  m4b-tools metadata audiobook.m4b --output metadata.csv
+        """
+
+_CONVERT_EPILOG = """
+Examples:
+  # Convert all MP3 files preserving structure
+  m4b-tools convert "**/*.mp3" ./output
+  
+  # Convert with custom base path and progress bar
+  m4b-tools convert "**/*.flac" ./converted -b /path/to/audiobooks -p
+  
+  # Convert with parallel processing (4 concurrent jobs)
+  m4b-tools convert "books/**/*.mp3" ./m4b_output -j 4
+  
+  # Pick the number of parallel jobs from the CPU count
+  m4b-tools convert "books/**/*.mp3" ./m4b_output -j 0
+  
+  # Convert to flat structure (all files in one directory)
+  m4b-tools convert "**/*.flac" ./output --flat
+  
+  # Show which files would be converted and where
+  m4b-tools convert "books/**/*.mp3" ./m4b_output --dry-run
+        """
+
+_COMBINE_EPILOG = """
+Examples:
+  # Combine all M4B files in current directory
+  m4b-tools combine "*.m4b" output.m4b
+  
+  # Combine files with custom title
+  m4b-tools combine "book_parts/*.m4b" "complete_book.m4b" --title "The Complete Book"
+  
+  # Preserve existing chapter structure within files
+  m4b-tools combine "**/*.m4b" combined.m4b --preserve-chapters
+  
+  # Use CSV file for advanced metadata control
+  m4b-tools combine --csv book_files.csv
+  
+  # Check chapter titles and offsets from a CSV without combining
+  m4b-tools combine --csv book_files.csv --dry-run
+  
+  # Combine several books, two at a time
+  m4b-tools combine --csv book1.csv --csv book2.csv -j 2
+        """
+
+_GENERATE_CSV_EPILOG = """
+Examples:
+  # Generate CSV template from current directory
+  m4b-tools generate-csv .
+  
+  # Generate CSV template from specific folder
+  m4b-tools generate-csv /path/to/m4b_files
+  
+  # Generate CSV template with custom output path
+  m4b-tools generate-csv ./books ./my_template.csv
+  
+  # Generate CSV templates for multiple folders using glob patterns
+  m4b-tools generate-csv "audiobooks/*"
+  m4b-tools generate-csv "/path/to/books/series_*"
+  m4b-tools generate-csv "**/*audiobook*"
+        """
+
+_SPLIT_EPILOG = """
+Examples:
+  # Split a single M4B file by chapters to MP3
+  m4b-tools split "audiobook.m4b" ./output_chapters
+  
+  # Split multiple M4B files to M4A format
+  m4b-tools split "*.m4b" ./chapters --format m4a
+  
+  # Split with custom naming template
+  m4b-tools split "book.m4b" ./output --template "{author}/{book_title}/Chapter {chapter_num:02d} - {chapter_title}.{ext}"
+  
+  # Split with parallel processing
+  m4b-tools split "**/*.m4b" ./output -j 4
+        """
+
+_METADATA_EPILOG = """
+Examples:
+  # Dump metadata as CSV (default)
+  m4b-tools metadata audiobook.m4b
+
+  # Write output to a file
+  m4b-tools metadata audiobook.m4b --output meta.csv
+        """
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -28,11 +132,12 @@ def setup_logging(verbose: bool = False) -> None:
 
 def cmd_convert(args) -> int:
     """Handle the convert command."""
+    from .converter import convert_all_to_m4b
     setup_logging(args.verbose)
     
     # Validate jobs argument
-    if args.jobs < 1:
-        print("Error: Number of jobs must be at least 1", file=sys.stderr)
+    if args.jobs < 0:
+        print("Error: Number of jobs must be 0 (auto) or more", file=sys.stderr)
         return 1
     
     # Convert files
@@ -42,10 +147,14 @@ def cmd_convert(args) -> int:
         preserve_structure=not args.flat,
         show_progress_bar=args.progress_bar,
         base_input_path=args.base_input_path,
-        max_workers=args.jobs
+        max_workers=args.jobs,
+        dry_run=args.dry_run
     )
     
-    if successful == total:
+    if args.dry_run:
+        print(f"✅ Dry run: {successful}/{total} files would be converted")
+        return 0
+    elif successful == total:
         print(f"✅ All {total} files converted successfully!")
         return 0
     else:
@@ -55,8 +164,12 @@ def cmd_convert(args) -> int:
 
 def cmd_combine(args) -> int:
     """Handle the combine command."""
+    from .combiner import combine_m4b_files
     setup_logging(args.verbose)
     
+    if args.csv and len(args.csv) > 1:
+        return _combine_many(args)
+    
     # Validate arguments
     if not args.csv and not args.pattern:
         print("Error: Either pattern or --csv must be provided", file=sys.stderr)
@@ -73,10 +186,17 @@ def cmd_combine(args) -> int:
         title=args.title,
         preserve_existing_chapters=args.preserve_chapters,
         temp_dir=args.temp_dir,
-        csv_file=args.csv
+        csv_file=args.csv[0] if args.csv else None,
+        hwaccel=args.hwaccel,
+        dry_run=args.dry_run,
+        stream_encoded=args.stream_encoded
     )
     
-    if success:
+    if success and args.dry_run:
+        print(success, end='')
+        print("✅ Dry run complete, no files were written")
+        return 0
+    elif success:
         output_name = args.output or "output from CSV"
         print(f"✅ Successfully combined M4B files into {output_name}")
         return 0
@@ -85,8 +205,47 @@ def cmd_combine(args) -> int:
         return 1
 
 
+def _combine_many(args) -> int:
+    """Combine one book per CSV file given to the combine command."""
+    from .combiner import combine_many
+    
+    if args.pattern or args.output or args.title or args.temp_dir:
+        print("Error: Output, title and --temp-dir come from each CSV when combining several",
+              file=sys.stderr)
+        return 1
+    
+    results = combine_many(
+        args.csv,
+        max_workers=args.jobs,
+        preserve_existing_chapters=args.preserve_chapters,
+        hwaccel=args.hwaccel,
+        dry_run=args.dry_run,
+        stream_encoded=args.stream_encoded
+    )
+    
+    successful = sum(1 for success in results.values() if success)
+    total = len(results)
+    for csv_file, success in results.items():
+        if not success:
+            print(f"❌ Failed to combine {csv_file}")
+        elif args.dry_run:
+            # Print each book's document whole, so parallel books don't interleave
+            print(f"==> {csv_file} <==")
+            print(success, end='')
+    
+    if args.dry_run and successful == total:
+        print(f"✅ Dry run complete for {total} books, no files were written")
+        return 0
+    if successful == total:
+        print(f"✅ All {total} books combined successfully!")
+        return 0
+    print(f"⚠️  {successful}/{total} books combined successfully")
+    return 1
+
+
 def cmd_generate_csv(args) -> int:
     """Handle the generate-csv command."""
+    from .combiner import generate_csv_from_folder
     setup_logging(args.verbose)
     
     # Generate CSV template
@@ -101,6 +260,7 @@ def cmd_generate_csv(args) -> int:
 
 def cmd_split(args) -> int:
     """Handle the split command."""
+    from .splitter import split_multiple_m4b_files
     setup_logging(args.verbose)
     
     # Validate arguments
@@ -138,27 +298,7 @@ def create_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="M4B Tools - Convert and combine audio files in M4B format",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Convert audio files to M4B
-  m4b-tools convert "**/*.mp3" ./output
-  m4b-tools convert "books/**/*.flac" ./converted -p -j 4
-  
-  # Generate CSV template for combining
-  m4b-tools generate-csv ./m4b_files
-  m4b-tools generate-csv "audiobooks/*"
-  
-  # Combine M4B files using pattern
-  m4b-tools combine "*.m4b" output.m4b --title "My Book"
-  
-  # Combine M4B files using CSV
-  m4b-tools combine --csv book_files.csv
-  
-  # Split M4B files by chapters
-  m4b-tools split "*.m4b" ./output_dir
-  
-  m4b-tools metadata audiobook.m4b --output metadata.csv
-        """
+        epilog=_MAIN_EPILOG
     )
     
     parser.add_argument(
@@ -181,20 +321,7 @@ Examples:
         'convert',
         help='Convert audio files to M4B format',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Convert all MP3 files preserving structure
-  m4b-tools convert "**/*.mp3" ./output
-  
-  # Convert with custom base path and progress bar
-  m4b-tools convert "**/*.flac" ./converted -b /path/to/audiobooks -p
-  
-  # Convert with parallel processing (4 concurrent jobs)
-  m4b-tools convert "books/**/*.mp3" ./m4b_output -j 4
-  
-  # Convert to flat structure (all files in one directory)
-  m4b-tools convert "**/*.flac" ./output --flat
-        """
+        epilog=_CONVERT_EPILOG
     )
     
     convert_parser.add_argument(
@@ -223,28 +350,21 @@ Examples:
         '--jobs', '-j',
         type=int,
         default=1,
-        help='Number of parallel FFmpeg processes (default: 1)'
+        help='Number of parallel FFmpeg processes, 0 to pick one per available CPU pair (default: 1)'
     )
+    convert_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print each input file and its output path without converting anything'
+    )
+    convert_parser.set_defaults(func=cmd_convert)
     
     # Combine command
     combine_parser = subparsers.add_parser(
         'combine',
         help='Combine M4B files into a single file with chapters',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Combine all M4B files in current directory
-  m4b-tools combine "*.m4b" output.m4b
-  
-  # Combine files with custom title
-  m4b-tools combine "book_parts/*.m4b" "complete_book.m4b" --title "The Complete Book"
-  
-  # Preserve existing chapter structure within files
-  m4b-tools combine "**/*.m4b" combined.m4b --preserve-chapters
-  
-  # Use CSV file for advanced metadata control
-  m4b-tools combine --csv book_files.csv
-        """
+        epilog=_COMBINE_EPILOG
     )
     
     combine_parser.add_argument(
@@ -259,7 +379,8 @@ Examples:
     )
     combine_parser.add_argument(
         '--csv',
-        help='CSV file with file paths, titles, and metadata'
+        action='append',
+        help='CSV file with file paths, titles, and metadata; repeat to combine one book per CSV'
     )
     combine_parser.add_argument(
         '--title',
@@ -272,30 +393,39 @@ Examples:
     )
     combine_parser.add_argument(
         '--temp-dir',
-        help='Use specified temporary directory (will not be removed)'
+        help='Use specified temporary directory (will not be removed), e.g. on a larger disk than /tmp'
+    )
+    combine_parser.add_argument(
+        '--hwaccel',
+        action='store_true',
+        help='Use hardware-accelerated decoding and the fastest available AAC encoder when re-encoding'
+    )
+    combine_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print the chapter metadata that would be written without running FFmpeg'
+    )
+    combine_parser.add_argument(
+        '--stream-encoded',
+        action='store_true',
+        help='Pipe re-encoded files into the final mux instead of staging them in the temporary '
+             'directory. Faster, but each file gains tens of milliseconds of encoder priming and '
+             'padding silence, so chapters start progressively later than in the sources'
+    )
+    combine_parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of books combined in parallel when several CSV files are given, 0 for one per CPU (default: 1)'
     )
+    combine_parser.set_defaults(func=cmd_combine)
     
     # Generate CSV command
     csv_parser = subparsers.add_parser(
         'generate-csv',
         help='Generate a CSV template from a folder containing M4B files',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Generate CSV template from current directory
-  m4b-tools generate-csv .
-  
-  # Generate CSV template from specific folder
-  m4b-tools generate-csv /path/to/m4b_files
-  
-  # Generate CSV template with custom output path
-  m4b-tools generate-csv ./books ./my_template.csv
-  
-  # Generate CSV templates for multiple folders using glob patterns
-  m4b-tools generate-csv "audiobooks/*"
-  m4b-tools generate-csv "/path/to/books/series_*"
-  m4b-tools generate-csv "**/*audiobook*"
-        """
+        epilog=_GENERATE_CSV_EPILOG
     )
     
     csv_parser.add_argument(
@@ -307,26 +437,14 @@ Examples:
         nargs='?',
         help='Output CSV file path (ignored when using glob patterns - each folder gets its own CSV file)'
     )
+    csv_parser.set_defaults(func=cmd_generate_csv)
     
     # Split command
     split_parser = subparsers.add_parser(
         'split',
         help='Split M4B files by chapters into various formats',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Split a single M4B file by chapters to MP3
-  m4b-tools split "audiobook.m4b" ./output_chapters
-  
-  # Split multiple M4B files to M4A format
-  m4b-tools split "*.m4b" ./chapters --format m4a
-  
-  # Split with custom naming template
-  m4b-tools split "book.m4b" ./output --template "{author}/{book_title}/Chapter {chapter_num:02d} - {chapter_title}.{ext}"
-  
-  # Split with parallel processing
-  m4b-tools split "**/*.m4b" ./output -j 4
-        """
+        epilog=_SPLIT_EPILOG
     )
     
     split_parser.add_argument(
@@ -354,20 +472,14 @@ Examples:
         default=1,
         help='Number of parallel chapter extraction processes (default: 1)'
     )
+    split_parser.set_defaults(func=cmd_split)
 
     # Metadata command (inlined)
     metadata_parser = subparsers.add_parser(
         'metadata',
         help='Dump M4B metadata in CSV format',
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Dump metadata as CSV (default)
-  m4b-tools metadata audiobook.m4b
-
-  # Write output to a file
-  m4b-tools metadata audiobook.m4b --output meta.csv
-        """
+        epilog=_METADATA_EPILOG
     )
     metadata_parser.add_argument(
         'file',
@@ -398,19 +510,7 @@ def main() -> int:
         return 1
     
     try:
-        if args.command == 'convert':
-            return cmd_convert(args)
-        elif args.command == 'combine':
-            return cmd_combine(args)
-        elif args.command == 'generate-csv':
-            return cmd_generate_csv(args)
-        elif args.command == 'split':
-            return cmd_split(args)
-        elif args.command == 'metadata':
-            return cmd_metadata(args)
-        else:
-            print(f"Unknown command: {args.command}", file=sys.stderr)
-            return 1
+        return args.func(args)
     except KeyboardInterrupt:
         print("\nOperation cancelled by user", file=sys.stderr)
         return 130
@@ -6,18 +6,27 @@ with chapters, generating CSV templates, and managing metadata.
 """
 
 import os
+import functools
 import glob
 import subprocess
 import tempfile
 import json
 import re
 import csv
+import email.utils
+import hashlib
+import io
+import itertools
+import shutil
+import threading
+import urllib.error
 import urllib.request
 import urllib.parse
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from collections import Counter
+from typing import AbstractSet, Iterator, List, Dict, Optional, Tuple, Union
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from contextlib import nullcontext
 import sys
@@ -29,7 +38,9 @@ else:
 
 from .utils import (
     check_ffmpeg, format_time, natural_sort_key, 
-    get_audio_metadata, ensure_output_directory, AudioMetadata
+    get_audio_metadata, get_audio_stream_info, ensure_output_directory, open_mp4,
+    select_aac_encoder, load_ffprobe_json, file_stat_key, drop_page_cache, resolve_binary,
+    prefetch_files, iter_matching_files, file_size, AudioMetadata, MP4_EXTENSIONS
 )
 
 # TypedDict definitions
@@ -73,16 +84,96 @@ class FileEntry(TypedDict):
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Filename cleanup patterns used when deriving chapter titles
+_CHAPTER_PREFIX_RE = re.compile(r'^(chapter|ch|part|pt)[\s\-_]*\d*[\s\-_]*', re.IGNORECASE)
+_LEADING_NUM_RE = re.compile(r'^\d+[\s\-_]*')
+
+# MP4_EXTENSIONS as a set, for iter_matching_files
+_MP4_EXTENSION_SET = frozenset(MP4_EXTENSIONS)
+
+# Book metadata fields and the FFMETADATA keys they are written under
+FFMETADATA_KEYS = (
+    ('title', 'title'),
+    ('artist', 'artist'),
+    ('album', 'album'),
+    ('author', 'album_artist'),
+    ('narrator', 'composer'),
+    ('genre', 'genre'),
+    ('year', 'date'),
+    ('description', 'comment'),
+)
+
+# Upper bound on concurrent ffprobe processes during metadata extraction
+MAX_PROBE_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
+# Cover art downloads: accepted file extensions, and the extension for each
+# image type a server may report when the URL has none
+COVER_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}
+COVER_CONTENT_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/bmp': '.bmp',
+    'image/webp': '.webp',
+}
+
+# Seconds to wait on a stalled cover art download before giving up
+COVER_DOWNLOAD_TIMEOUT = 30
+
+# Lines of FFmpeg's stderr kept for the error report of a long-running combine
+FFMPEG_STDERR_TAIL_LINES = 100
+
+# Encoder delay, in samples, of the AAC encoders select_aac_encoder may pick;
+# streamed ADTS keeps these samples, so chapter offsets must account for them
+AAC_ENCODER_PRIMING = {
+    'aac': 1024,
+    'libfdk_aac': 2048,
+    'aac_at': 2112,
+}
+
+# Streaming re-encode: bytes read from an encoder at a time, and the memory
+# budget for output encoded ahead of the file being written
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_BUFFER_BYTES = 64 * 1024 * 1024
+
 
 def extract_existing_chapters(file_path: str) -> List[ChapterWithDuration]:
     """Extract existing chapter information from an M4B file."""
+    key = file_stat_key(file_path)
+    if key is None:
+        return _read_existing_chapters(file_path)
+    # Copy so callers can't mutate the cached entries
+    return [dict(c) for c in _read_existing_chapters_cached(key)]
+
+
+@functools.lru_cache(maxsize=4096)
+def _read_existing_chapters_cached(key: Tuple[str, int, int]) -> List[ChapterWithDuration]:
+    return _read_existing_chapters(key[0])
+
+
+def _read_existing_chapters(file_path: str) -> List[ChapterWithDuration]:
+    audio = open_mp4(file_path)
+    if audio is not None and getattr(audio, 'chapters', None):
+        # Chapters only carry start times; each ends where the next begins
+        mp4_chapters = list(audio.chapters)
+        ends = [c.start for c in mp4_chapters[1:]] + [float(audio.info.length)]
+        return [
+            {
+                'title': c.title or f"Chapter {i}",
+                'start': c.start,
+                'end': end,
+                'duration': end - c.start
+            }
+            for i, (c, end) in enumerate(zip(mp4_chapters, ends), 1)
+        ]
+    
     try:
         cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            resolve_binary('ffprobe'), '-v', 'quiet', '-print_format', 'json',
             '-show_chapters', file_path
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        data = load_ffprobe_json(result.stdout)
         
         chapters = []
         for chapter in data.get('chapters', []):
@@ -99,19 +190,93 @@ def extract_existing_chapters(file_path: str) -> List[ChapterWithDuration]:
         
         return chapters
     except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-        logger.warning(f"Could not extract chapters from {file_path}: {e}")
+        logger.warning("Could not extract chapters from %s: %s", file_path, e)
+        return []
+
+
+def extract_files_chapters(file_paths: List[str]) -> List[List[ChapterWithDuration]]:
+    """
+    Extract existing chapters from multiple files concurrently.
+    
+    Returns:
+        List of chapter lists in the same order as file_paths
+    """
+    if not file_paths:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(file_paths))) as executor:
+        return list(executor.map(extract_existing_chapters, file_paths))
+
+
+def probe_files_metadata(file_paths: List[str],
+                         stream_info_only: AbstractSet[str] = frozenset()) -> List[AudioMetadata]:
+    """
+    Extract metadata from multiple files concurrently.
+    
+    Each file is probed by its own ffprobe process; the processes are I/O bound,
+    so a bounded thread pool overlaps their startup and read latency.
+    
+    Args:
+        file_paths: Paths to the audio files
+        stream_info_only: Paths whose tags are not needed; these only get the
+                          cheaper duration/stream probe
+        
+    Returns:
+        List of metadata dicts in the same order as file_paths
+    """
+    if not file_paths:
         return []
+    
+    results: List[AudioMetadata] = [{} for _ in file_paths]
+    max_workers = min(MAX_PROBE_WORKERS, len(file_paths))
+    log_progress = logger.isEnabledFor(logging.DEBUG)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_index = {
+            executor.submit(
+                get_audio_stream_info if file_path in stream_info_only else get_audio_metadata,
+                file_path
+            ): index
+            for index, file_path in enumerate(file_paths)
+        }
+        
+        for completed, future in enumerate(as_completed(future_to_index), 1):
+            index = future_to_index[future]
+            results[index] = future.result()
+            if log_progress:
+                logger.debug("Probed %s/%s: %s", completed, len(file_paths), os.path.basename(file_paths[index]))
+    
+    return results
+
+
+def _escape_concat_path(file_path: str) -> str:
+    """Escape a path for a single-quoted FFmpeg concat entry."""
+    # Most paths contain no quotes, so skip the replace for them
+    if "'" not in file_path:
+        return file_path
+    # Replace single quotes with escaped single quotes
+    return file_path.replace("'", "'\\''")
+
+
+def format_concat_list(files: List[str], as_urls: bool = False) -> str:
+    """
+    Format the FFmpeg concat demuxer list for files.
+    
+    Args:
+        files: Paths to the files, in playback order
+        as_urls: Write absolute file: URLs, which resolve correctly when FFmpeg
+                 reads the list from a pipe instead of a file on disk
+    """
+    if as_urls:
+        files = ['file:' + os.path.abspath(file_path) for file_path in files]
+    return ''.join([f"file '{_escape_concat_path(file_path)}'\n" for file_path in files])
 
 
 def create_concat_file(files: List[str], temp_dir: str) -> str:
     """Create a temporary concat file for FFmpeg."""
     concat_path = os.path.join(temp_dir, 'concat_list.txt')
     with open(concat_path, 'w', encoding='utf-8') as f:
-        for file_path in files:
-            # Escape special characters for FFmpeg concat format
-            # Replace single quotes with escaped single quotes and wrap in single quotes
-            escaped_path = file_path.replace("'", "'\\''")
-            f.write(f"file '{escaped_path}'\n")
+        f.write(format_concat_list(files))
     return concat_path
 
 
@@ -119,45 +284,29 @@ def create_chapter_metadata(chapters: List[Chapter], temp_dir: str, metadata: Bo
     """Create FFmpeg metadata file with chapter information."""
     metadata_path = os.path.join(temp_dir, 'metadata.txt')
     
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        f.write(";FFMETADATA1\n")
-        
-        # Add book metadata
-        title = metadata.get('title')
-        if title:
-            f.write(f"title={title}\n")
-        artist = metadata.get('artist')
-        if artist:
-            f.write(f"artist={artist}\n")
-        album = metadata.get('album')
-        if album:
-            f.write(f"album={album}\n")
-        author = metadata.get('author')
-        if author:
-            f.write(f"album_artist={author}\n")
-        narrator = metadata.get('narrator')
-        if narrator:
-            f.write(f"composer={narrator}\n")
-        genre = metadata.get('genre')
-        if genre:
-            f.write(f"genre={genre}\n")
-        year = metadata.get('year')
-        if year:
-            f.write(f"date={year}\n")
-        description = metadata.get('description')
-        if description:
-            f.write(f"comment={description}\n")
-        
-        f.write("\n")
-        
-        # Add chapters
-        for chapter in chapters:
-            f.write("[CHAPTER]\n")
-            f.write("TIMEBASE=1/1000\n")
-            f.write(f"START={int(chapter['start'] * 1000)}\n")
-            f.write(f"END={int(chapter['end'] * 1000)}\n")
-            f.write(f"title={chapter['title']}\n")
-            f.write("\n")
+    # Build the whole document first and write it in one go
+    parts = [";FFMETADATA1\n"]
+    
+    # Add book metadata
+    for key, ffmetadata_key in FFMETADATA_KEYS:
+        value = metadata.get(key)
+        if value:
+            parts.append(f"{ffmetadata_key}={value}\n")
+    
+    parts.append("\n")
+    
+    # Add chapters
+    for chapter in chapters:
+        parts.append(
+            f"[CHAPTER]\n"
+            f"TIMEBASE=1/1000\n"
+            f"START={int(chapter['start'] * 1000)}\n"
+            f"END={int(chapter['end'] * 1000)}\n"
+            f"title={chapter['title']}\n"
+            f"\n"
+        )
+    
+    Path(metadata_path).write_text("".join(parts), encoding='utf-8')
     
     return metadata_path
 
@@ -181,17 +330,412 @@ def check_audio_compatibility(files_metadata: List[ProcessedAudioMetadata]) -> b
     return True
 
 
+def _reencode_command(input_file: str, aac_encoder: str, sample_rate: str,
+                      threads: int, hwaccel: bool) -> List[str]:
+    """Build the FFmpeg arguments shared by every re-encode, up to the output format."""
+    cmd = [resolve_binary('ffmpeg'), '-nostats']
+    if hwaccel:
+        cmd.extend(['-hwaccel', 'auto'])
+    cmd.extend([
+        '-i', input_file,
+        '-vn',
+        '-c:a', aac_encoder, '-b:a', '64k', '-ac', '2', '-ar', str(sample_rate),
+        '-threads', str(threads), '-filter_threads', str(threads),
+    ])
+    return cmd
+
+
+def _plan_reencode(file_count: int, hwaccel: bool,
+                   cpu_count: Optional[int] = None) -> Tuple[str, int, int]:
+    """
+    Pick the AAC encoder and split the CPUs between parallel re-encodes.
+    
+    Args:
+        file_count: Number of files to re-encode
+        hwaccel: If True, use the fastest available AAC encoder
+        cpu_count: CPUs available to the re-encodes (defaults to all of them)
+        
+    Returns:
+        Tuple of (encoder name, number of parallel encodes, threads per encode)
+    """
+    aac_encoder = select_aac_encoder(hwaccel)
+    cpu_count = cpu_count or os.cpu_count() or 1
+    max_workers = max(1, min(cpu_count, file_count))
+    threads = max(1, cpu_count // max_workers)
+    logger.info("Re-encoding %s files with %s using %s parallel job(s)", file_count, aac_encoder, max_workers)
+    return aac_encoder, max_workers, threads
+
+
+def encode_for_concat(input_file: str, output_file: str, aac_encoder: str,
+                      sample_rate: str, threads: int = 1, hwaccel: bool = False) -> bool:
+    """
+    Re-encode a single file to AAC with fixed parameters for stream-copy concatenation.
+    
+    Args:
+        input_file: Path to the source audio file
+        output_file: Path to the intermediate file to create
+        aac_encoder: FFmpeg AAC encoder name
+        sample_rate: Output sample rate shared by all intermediates
+        threads: Number of FFmpeg threads for this encode
+        hwaccel: If True, use hardware-accelerated decoding
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    cmd = _reencode_command(input_file, aac_encoder, sample_rate, threads, hwaccel)
+    cmd.extend([
+        '-f', 'mp4',
+        '-y',  # Overwrite output
+        output_file
+    ])
+    
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        return True
+    except subprocess.CalledProcessError as e:
+        logger.error("Failed to re-encode %s: %s", input_file, e.stderr.decode('utf-8', 'replace'))
+        return False
+
+
+def reencode_files_for_concat(files: List[str], output_dir: str, sample_rate: str,
+                              hwaccel: bool = False,
+                              cpu_count: Optional[int] = None) -> Optional[List[str]]:
+    """
+    Re-encode files to AAC intermediates in parallel.
+    
+    Each file gets its own FFmpeg process, so the encode scales across cores
+    instead of running serially through one concatenated stream.
+    
+    Args:
+        files: Paths to the source audio files
+        output_dir: Directory for the intermediate files
+        sample_rate: Output sample rate shared by all intermediates
+        hwaccel: If True, use hardware-accelerated decoding and the fastest AAC encoder
+        cpu_count: CPUs to spread the encodes over (defaults to all of them)
+        
+    Returns:
+        Paths to the intermediates in input order, or None if any encode failed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    outputs = [os.path.join(output_dir, f"{i:03d}.m4a") for i in range(len(files))]
+    aac_encoder, max_workers, threads = _plan_reencode(len(files), hwaccel, cpu_count)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            lambda pair: encode_for_concat(pair[0], pair[1], aac_encoder, sample_rate, threads, hwaccel),
+            zip(files, outputs)
+        ))
+    
+    if not all(results):
+        return None
+    return outputs
+
+
+def open_encoded_stream(input_file: str, aac_encoder: str, sample_rate: str, threads: int = 1,
+                        hwaccel: bool = False) -> subprocess.Popen:
+    """
+    Start re-encoding a file to an ADTS AAC stream on the process's stdout.
+    
+    ADTS frames carry their own headers, so the streams of several files
+    encoded with the same parameters can be joined by concatenating bytes.
+    
+    Args:
+        input_file: Path to the source audio file
+        aac_encoder: FFmpeg AAC encoder name
+        sample_rate: Output sample rate shared by all streams
+        threads: Number of FFmpeg threads for this encode
+        hwaccel: If True, use hardware-accelerated decoding
+        
+    Returns:
+        The running FFmpeg process, with stdout and stderr piped
+    """
+    cmd = _reencode_command(input_file, aac_encoder, sample_rate, threads, hwaccel)
+    cmd.extend(['-f', 'adts', 'pipe:1'])
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def adts_stream_duration(duration: float, sample_rate: int, priming: int = 1024) -> float:
+    """
+    Predict the length of the ADTS stream open_encoded_stream produces.
+    
+    The encoder's priming samples come first and the total is rounded up to
+    whole 1024-sample frames; ADTS can mark neither for trimming.
+    
+    Args:
+        duration: Source duration in seconds
+        sample_rate: Output sample rate
+        priming: Encoder delay in samples (see AAC_ENCODER_PRIMING)
+        
+    Returns:
+        Duration of the encoded stream in seconds
+    """
+    frames = -(-(round(duration * sample_rate) + priming) // 1024)
+    return frames * 1024 / sample_rate
+
+
+def _encode_to_buffer(index: int, input_file: str, aac_encoder: str, sample_rate: str,
+                      threads: int, hwaccel: bool, buffer: '_EncodedStreamBuffer') -> None:
+    """Encode one file, handing its ADTS stream to the buffer chunk by chunk."""
+    success = False
+    try:
+        if not buffer.aborted:
+            success = _copy_encoded_stream(index, input_file, aac_encoder, sample_rate,
+                                           threads, hwaccel, buffer)
+    except OSError as e:
+        logger.error("Failed to re-encode %s: %s", input_file, e)
+    finally:
+        # Always post the end marker, so the writer never waits on a dead encoder
+        buffer.finish(index, success)
+
+
+def _copy_encoded_stream(index: int, input_file: str, aac_encoder: str, sample_rate: str,
+                         threads: int, hwaccel: bool, buffer: '_EncodedStreamBuffer') -> bool:
+    process = open_encoded_stream(input_file, aac_encoder, sample_rate, threads, hwaccel)
+    stderr_tail: deque = deque(maxlen=FFMPEG_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=stderr_tail.extend, args=(process.stderr,), daemon=True)
+    drain.start()
+    
+    try:
+        for chunk in iter(functools.partial(process.stdout.read, STREAM_CHUNK_SIZE), b''):
+            if not buffer.put(index, chunk):
+                process.kill()
+                break
+    finally:
+        process.stdout.close()
+        process.wait()
+        drain.join()
+    
+    if process.returncode != 0:
+        if not buffer.aborted:
+            stderr = b''.join(stderr_tail).decode('utf-8', 'replace')
+            logger.error("Failed to re-encode %s: %s", input_file, stderr)
+        return False
+    return not buffer.aborted
+
+
+class _EncodedStreamBuffer:
+    """
+    Ordered hand-off of encoded chunks from parallel encoders to a single writer.
+    
+    The file being written passes straight through; encoders running ahead of
+    it wait once the chunks they have buffered reach max_bytes in total.
+    """
+    
+    def __init__(self, file_count: int, max_bytes: int):
+        self._chunks: List[deque] = [deque() for _ in range(file_count)]
+        self._max_bytes = max_bytes
+        self._buffered = 0
+        self._head = 0
+        self._condition = threading.Condition()
+        self.aborted = False
+    
+    def put(self, index: int, chunk: bytes) -> bool:
+        """Queue a chunk of file index; returns False once the stream was aborted."""
+        with self._condition:
+            while (not self.aborted and index != self._head
+                   and self._buffered >= self._max_bytes):
+                self._condition.wait()
+            if self.aborted:
+                return False
+            self._chunks[index].append(chunk)
+            self._buffered += len(chunk)
+            self._condition.notify_all()
+            return True
+    
+    def finish(self, index: int, success: bool) -> None:
+        """Mark the end of file index's stream."""
+        with self._condition:
+            self._chunks[index].append(success)
+            self._condition.notify_all()
+    
+    def take(self, index: int):
+        """Wait for the next chunk of file index, or the True/False end marker."""
+        with self._condition:
+            while not self._chunks[index]:
+                self._condition.wait()
+            item = self._chunks[index].popleft()
+            if isinstance(item, bytes):
+                self._buffered -= len(item)
+                self._condition.notify_all()
+            elif item:
+                self._head = index + 1
+                self._condition.notify_all()
+            return item
+    
+    def abort(self) -> None:
+        """Stop every encoder still producing output."""
+        with self._condition:
+            self.aborted = True
+            self._condition.notify_all()
+
+
+def stream_encoded_files(files: List[str], sink, sample_rate: str, hwaccel: bool = False,
+                         max_buffer_bytes: int = STREAM_BUFFER_BYTES,
+                         cpu_count: Optional[int] = None) -> bool:
+    """
+    Re-encode files in parallel and write their AAC streams to sink in input order.
+    
+    Encoders running ahead of the file being written hold at most
+    max_buffer_bytes of output in memory between them, and nothing is staged
+    on disk between the encoders and the consumer.
+    
+    Args:
+        files: Paths to the source audio files
+        sink: Binary file object receiving the concatenated ADTS stream
+        sample_rate: Output sample rate shared by all streams
+        hwaccel: If True, use hardware-accelerated decoding and the fastest AAC encoder
+        max_buffer_bytes: Memory budget for output encoded ahead of the writer
+        cpu_count: CPUs to spread the encodes over (defaults to all of them)
+        
+    Returns:
+        True if every file was encoded and written, False otherwise
+    """
+    aac_encoder, max_workers, threads = _plan_reencode(len(files), hwaccel, cpu_count)
+    buffer = _EncodedStreamBuffer(len(files), max_buffer_bytes)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_encode_to_buffer, index, input_file, aac_encoder, sample_rate,
+                            threads, hwaccel, buffer)
+            for index, input_file in enumerate(files)
+        ]
+        
+        completed = False
+        try:
+            for index in range(len(files)):
+                item = buffer.take(index)
+                while isinstance(item, bytes):
+                    sink.write(item)
+                    item = buffer.take(index)
+                if not item:
+                    return False
+            completed = True
+        finally:
+            if not completed:
+                # Stop the running encoders and drop the ones not started yet
+                buffer.abort()
+                for future in futures:
+                    future.cancel()
+    
+    return True
+
+
+def _run_with_encoded_input(cmd: List[str], files: List[str], sample_rate: str, hwaccel: bool,
+                            cpu_count: Optional[int] = None) -> bool:
+    """Run an FFmpeg command that reads the re-encoded files as ADTS on stdin."""
+    process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE)
+    
+    # Drain stderr concurrently so FFmpeg never blocks on a full pipe while we
+    # write, keeping only the last lines for the error report
+    stderr_tail: deque = deque(maxlen=FFMPEG_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=stderr_tail.extend, args=(process.stderr,), daemon=True)
+    drain.start()
+    
+    try:
+        streamed = stream_encoded_files(files, process.stdin, sample_rate, hwaccel,
+                                        cpu_count=cpu_count)
+    except BrokenPipeError:
+        streamed = False
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+    
+    if not streamed and process.poll() is None:
+        # Don't let FFmpeg finalize a truncated audiobook
+        process.kill()
+    
+    process.wait()
+    drain.join()
+    if not streamed or process.returncode != 0:
+        stderr = b''.join(stderr_tail).decode('utf-8', 'replace')
+        logger.error("Failed to combine audio files: %s", stderr)
+        return False
+    return True
+
+
+def _cover_cache_dir() -> str:
+    """Directory where downloaded cover art is kept between runs."""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'm4b-tools', 'covers')
+
+
+def _find_cached_cover(entry_dir: str) -> Optional[str]:
+    """Return the cached cover image in a cache entry directory, if there is one."""
+    try:
+        names = [name for name in os.listdir(entry_dir) if name.startswith('cover.')]
+    except OSError:
+        return None
+    return os.path.join(entry_dir, names[0]) if names else None
+
+
+def _store_cached_cover(entry_dir: str, image_path: str, last_modified: Optional[str]) -> None:
+    """
+    Copy a downloaded cover into its cache entry, replacing any older image.
+    
+    The copy is written beside the entry and renamed into place, so another
+    process reading the cached image never sees it missing or half written.
+    """
+    temp_path = None
+    try:
+        os.makedirs(entry_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=entry_dir, prefix='.download-')
+        with os.fdopen(fd, 'wb') as f, open(image_path, 'rb') as image:
+            shutil.copyfileobj(image, f)
+        if last_modified:
+            # Revalidate against the server's timestamp rather than our download time
+            timestamp = email.utils.parsedate_to_datetime(last_modified).timestamp()
+            os.utime(temp_path, (timestamp, timestamp))
+        
+        cached_name = os.path.basename(image_path)
+        os.replace(temp_path, os.path.join(entry_dir, cached_name))
+        temp_path = None
+        
+        # Drop an older image saved under another extension
+        for name in os.listdir(entry_dir):
+            if name.startswith('cover.') and name != cached_name:
+                os.remove(os.path.join(entry_dir, name))
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Could not cache cover art in %s: %s", entry_dir, e)
+    finally:
+        if temp_path:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def _copy_cached_cover(cached_path: str, temp_dir: str) -> Optional[str]:
+    """Copy a cached cover into temp_dir, so the cache can change while it's in use."""
+    output_path = os.path.join(temp_dir, os.path.basename(cached_path))
+    try:
+        shutil.copyfile(cached_path, output_path)
+    except OSError as e:
+        logger.warning("Could not copy cached cover art %s: %s", cached_path, e)
+        return None
+    return output_path
+
+
 def download_cover_art(url: str, temp_dir: str) -> Optional[str]:
     """
     Download cover art from URL to temporary directory.
     
+    Downloads are also kept in a per-user cache. When a cached copy exists the
+    request is conditional, and the cached copy is used if the server reports
+    it unchanged or can't be reached.
+    
     Args:
         url: URL to download cover art from
         temp_dir: Temporary directory to save the image
         
     Returns:
-        Path to downloaded file, or None if download failed
+        Path to the image in temp_dir, or None if download failed
     """
+    entry_dir = os.path.join(_cover_cache_dir(), hashlib.sha256(url.encode('utf-8')).hexdigest()[:16])
+    cached_path = _find_cached_cover(entry_dir)
+    
     try:
         # Parse URL to get file extension
         parsed_url = urllib.parse.urlparse(url)
@@ -199,27 +743,47 @@ def download_cover_art(url: str, temp_dir: str) -> Optional[str]:
         
         # Try to determine file extension from URL
         ext = os.path.splitext(path)[1].lower()
-        if not ext or ext not in {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'}:
-            # Default to .jpg if no extension or unknown extension
-            ext = '.jpg'
         
-        output_path = os.path.join(temp_dir, f'cover{ext}')
-        
-        logger.info(f"Downloading cover art from: {url}")
-        with urllib.request.urlopen(url) as response:
+        logger.info("Downloading cover art from: %s", url)
+        # Images are already compressed, so skip transfer encoding
+        headers = {'Accept-Encoding': 'identity'}
+        if cached_path:
+            headers['If-Modified-Since'] = email.utils.formatdate(
+                os.stat(cached_path).st_mtime, usegmt=True
+            )
+        request = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(request, timeout=COVER_DOWNLOAD_TIMEOUT) as response:
+            if ext not in COVER_EXTENSIONS:
+                # Fall back to the served image type, then to .jpg
+                content_type = response.headers.get_content_type()
+                ext = COVER_CONTENT_TYPES.get(content_type, '.jpg')
+            
+            output_path = os.path.join(temp_dir, f'cover{ext}')
             with open(output_path, 'wb') as f:
-                f.write(response.read())
+                # Stream to disk in chunks rather than buffering the whole image
+                shutil.copyfileobj(response, f, 64 * 1024)
+            last_modified = response.headers.get('Last-Modified')
         
         # Verify the file was downloaded and has content
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            logger.info(f"Cover art downloaded: {output_path}")
+        if file_size(output_path) > 0:
+            logger.info("Cover art downloaded: %s", output_path)
+            _store_cached_cover(entry_dir, output_path, last_modified)
             return output_path
         else:
             logger.warning("Downloaded cover art file is empty")
             return None
-            
+    
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached_path:
+            logger.info("Cover art unchanged, using cached copy: %s", cached_path)
+            return _copy_cached_cover(cached_path, temp_dir)
+        logger.warning("Failed to download cover art from %s: %s", url, e)
+        return None
     except Exception as e:
-        logger.warning(f"Failed to download cover art from {url}: {e}")
+        if cached_path and isinstance(e, (urllib.error.URLError, OSError)):
+            logger.warning("Could not reach %s (%s), using cached cover art", url, e)
+            return _copy_cached_cover(cached_path, temp_dir)
+        logger.warning("Failed to download cover art from %s: %s", url, e)
         return None
 
 
@@ -238,26 +802,84 @@ def derive_chapter_title(file_path: str, index: int, existing_title: str = "") -
     if existing_title.strip():
         return existing_title.strip()
     
-    # Extract filename without extension
-    filename = Path(file_path).stem
+    cleaned = _clean_title(_file_stem(file_path))
+    if cleaned:
+        return cleaned
+    else:
+        return f"Chapter {index}"
+
+
+def _file_stem(file_path: str) -> str:
+    """Filename without its directory or extension."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def _clean_title(filename: str) -> str:
+    """
+    Turn a filename stem into a title.
     
-    # Try to extract meaningful title from filename
+    Strips prefixes like "Chapter 3" and leading track numbers, turns
+    separators into spaces and title-cases the rest. Returns an empty string if
+    nothing is left.
+    """
     # Remove common prefixes like "Chapter", "Ch", "Part", "Pt"
-    cleaned = re.sub(r'^(chapter|ch|part|pt)[\s\-_]*\d*[\s\-_]*', '', filename, flags=re.IGNORECASE)
+    cleaned = _CHAPTER_PREFIX_RE.sub('', filename)
     
     # Remove leading numbers
-    cleaned = re.sub(r'^\d+[\s\-_]*', '', cleaned)
+    cleaned = _LEADING_NUM_RE.sub('', cleaned)
     
-    # Replace underscores and hyphens with spaces
-    cleaned = cleaned.replace('_', ' ').replace('-', ' ')
+    # Replace underscores and hyphens with spaces, and normalize whitespace
+    cleaned = ' '.join(cleaned.replace('_', ' ').replace('-', ' ').split())
+    return cleaned.title()
+
+
+def _extract_title_or_derive(file_path: str, metadata: AudioMetadata) -> str:
+    """
+    Pick the CSV template title for a file.
     
-    # Normalize whitespace
-    cleaned = ' '.join(cleaned.split())
+    Uses the file's title tag if present, otherwise a title cleaned up from the
+    filename, falling back to the bare filename.
+    """
+    # First try to get title from file metadata
+    metadata_title = metadata.get('title', '').strip() if metadata else ''
+    if metadata_title:
+        return metadata_title
+    
+    # Fall back to generating chapter title from filename
+    filename = _file_stem(file_path)
+    return _clean_title(filename) or filename
+
+
+def iter_m4b_files(folder_path: str) -> Iterator[str]:
+    """
+    Recursively yield M4B/M4A files under a folder.
     
-    if cleaned:
-        return cleaned.title()
-    else:
-        return f"Chapter {index}"
+    Filters by extension during the directory walk, using the file type cached
+    on each directory entry instead of a separate stat per path. Hidden entries
+    are skipped, matching glob's "**" behavior.
+    
+    Args:
+        folder_path: Folder to search
+        
+    Yields:
+        Full paths to matching files
+    """
+    # Walk with an explicit stack rather than recursion, so deep trees neither
+    # hit the recursion limit nor pass every match up a chain of generators
+    pending = [folder_path]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(MP4_EXTENSIONS) and entry.is_file():
+                        yield entry.path
+        except OSError as e:
+            logger.warning("Could not read directory %s: %s", directory, e)
 
 
 def generate_csv_from_folder(folder_path: str, output_csv: Optional[str] = None) -> bool:
@@ -294,13 +916,7 @@ def generate_csv_from_multiple_folders(folder_pattern: str, base_output_csv: Opt
     # Find all directories matching the pattern
     matching_folders = []
     
-    # Handle different types of glob patterns
-    if os.path.isabs(folder_pattern):
-        # Absolute path pattern
-        potential_matches = glob.glob(folder_pattern, recursive=True)
-    else:
-        # Relative path pattern
-        potential_matches = glob.glob(folder_pattern, recursive=True)
+    potential_matches = glob.glob(folder_pattern, recursive=True)
     
     # Filter to only include directories
     for match in potential_matches:
@@ -308,37 +924,57 @@ def generate_csv_from_multiple_folders(folder_pattern: str, base_output_csv: Opt
             matching_folders.append(os.path.abspath(match))
     
     if not matching_folders:
-        logger.error(f"No directories found matching pattern: {folder_pattern}")
+        logger.error("No directories found matching pattern: %s", folder_pattern)
         return False
     
-    logger.info(f"Found {len(matching_folders)} directories matching pattern: {folder_pattern}")
+    logger.info("Found %s directories matching pattern: %s", len(matching_folders), folder_pattern)
     
     successful_csvs = 0
     total_folders = len(matching_folders)
-    
-    for folder_path in sorted(matching_folders):
+    matching_folders.sort()
+    
+    # Walk each folder once, then probe every folder's files in one pool up front,
+    # so folders holding only a few files don't leave it idle
+    folder_files = {}
+    for folder_path in matching_folders:
+        m4b_files = list(iter_m4b_files(folder_path))
+        m4b_files.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
+        folder_files[folder_path] = m4b_files
+    all_metadata = iter(probe_files_metadata([
+        file_path for folder_path in matching_folders for file_path in folder_files[folder_path]
+    ]))
+    
+    for folder_path in matching_folders:
         folder_name = os.path.basename(folder_path)
-        logger.info(f"Processing folder: {folder_name}")
+        logger.info("Processing folder: %s", folder_name)
+        m4b_files = folder_files[folder_path]
+        files_metadata = [next(all_metadata) for _ in m4b_files]
         
         # Generate CSV for this folder (output_csv=None means auto-generate name)
-        success = generate_csv_from_single_folder(folder_path, None)
+        success = generate_csv_from_single_folder(folder_path, None, m4b_files, files_metadata)
         if success:
             successful_csvs += 1
         else:
-            logger.warning(f"Failed to generate CSV for folder: {folder_name}")
+            logger.warning("Failed to generate CSV for folder: %s", folder_name)
     
-    logger.info(f"Successfully generated {successful_csvs}/{total_folders} CSV files")
+    logger.info("Successfully generated %s/%s CSV files", successful_csvs, total_folders)
     
     return successful_csvs > 0
 
 
-def generate_csv_from_single_folder(folder_path: str, output_csv: Optional[str] = None) -> bool:
+def generate_csv_from_single_folder(folder_path: str, output_csv: Optional[str] = None,
+                                    m4b_files: Optional[List[str]] = None,
+                                    files_metadata: Optional[List[AudioMetadata]] = None) -> bool:
     """
     Generate a CSV template file from a single folder containing M4B files.
     
     Args:
         folder_path: Path to folder containing M4B files
         output_csv: Output CSV file path (defaults to folder_name.csv)
+        m4b_files: M4B files already found in the folder, in natural order
+                   (defaults to scanning the folder)
+        files_metadata: Metadata of m4b_files, in the same order
+                        (defaults to probing them)
         
     Returns:
         True if successful, False otherwise
@@ -346,26 +982,22 @@ def generate_csv_from_single_folder(folder_path: str, output_csv: Optional[str]
     folder_path = os.path.abspath(folder_path)
     
     if not os.path.exists(folder_path):
-        logger.error(f"Folder not found: {folder_path}")
+        logger.error("Folder not found: %s", folder_path)
         return False
     
     if not os.path.isdir(folder_path):
-        logger.error(f"Path is not a directory: {folder_path}")
+        logger.error("Path is not a directory: %s", folder_path)
         return False
     
-    # Find all M4B files in the folder
-    m4b_files = []
-    for file_path in glob.glob(os.path.join(folder_path, "**", "*"), recursive=True):
-        if os.path.isfile(file_path) and Path(file_path).suffix.lower() in {'.m4b', '.m4a'}:
-            m4b_files.append(file_path)
+    if m4b_files is None:
+        # Find all M4B files in the folder, sorted naturally
+        m4b_files = list(iter_m4b_files(folder_path))
+        m4b_files.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
     
     if not m4b_files:
-        logger.error(f"No M4B files found in folder: {folder_path}")
+        logger.error("No M4B files found in folder: %s", folder_path)
         return False
     
-    # Sort files naturally
-    m4b_files.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
-    
     # Generate output CSV path if not provided
     if not output_csv:
         folder_name = os.path.basename(folder_path)
@@ -377,15 +1009,13 @@ def generate_csv_from_single_folder(folder_path: str, output_csv: Optional[str]
     folder_name = os.path.basename(folder_path)
     output_m4b = os.path.join(folder_path, f"{folder_name}.m4b")
     
-    logger.info(f"Generating CSV template for {len(m4b_files)} M4B files...")
+    logger.info("Generating CSV template for %s M4B files...", len(m4b_files))
     
     # Extract metadata from all files to populate template
-    logger.info("Analyzing metadata from files...")
-    all_metadata = []
-    for file_path in m4b_files:
-        metadata = get_audio_metadata(file_path)
-        if metadata:
-            all_metadata.append(metadata)
+    if files_metadata is None:
+        logger.info("Analyzing metadata from files...")
+        files_metadata = probe_files_metadata(m4b_files)
+    all_metadata = [metadata for metadata in files_metadata if metadata]
     
     # Aggregate metadata for template (use most common values or first non-empty)
     def get_most_common_or_first(field):
@@ -404,65 +1034,55 @@ def generate_csv_from_single_folder(folder_path: str, output_csv: Optional[str]
     template_year = get_most_common_or_first('year')
     template_description = get_most_common_or_first('description')
     
-    logger.info(f"Detected metadata - Title: '{template_title}', Author: '{template_author}', Narrator: '{template_narrator}', Year: '{template_year}'")
+    logger.info("Detected metadata - Title: '%s', Author: '%s', Narrator: '%s', Year: '%s'", template_title, template_author, template_narrator, template_year)
+    
+    # Build all file rows up front so the write below is a single batch. Files
+    # under the CSV's directory (the default) just have the prefix sliced off,
+    # avoiding relpath's normalization of both paths per file
+    csv_dir = os.path.dirname(output_csv)
+    csv_prefix = os.path.join(csv_dir, '')
+    rows = [
+        (
+            file_path[len(csv_prefix):] if file_path.startswith(csv_prefix)
+            else os.path.relpath(file_path, csv_dir),
+            _extract_title_or_derive(file_path, metadata)
+        )
+        for file_path, metadata in zip(m4b_files, files_metadata)
+    ]
+    
+    # Assemble the whole template in memory so the file gets a single write
+    buffer = io.StringIO()
+    buffer.write(
+        f"#title,{template_title}\n"
+        f"#author,{template_author}\n"
+        f"#narrator,{template_narrator}\n"
+        f"#genre,{template_genre}\n"
+        f"#year,{template_year}\n"
+        f"#description,{template_description}\n"
+        f"#output_path,{output_m4b}\n"
+        "#cover_path,\n"
+        "\n"
+    )
+    writer = csv.writer(buffer)
+    writer.writerow(['file', 'title'])
+    writer.writerows(rows)
     
     try:
         with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-            # Write metadata headers with extracted values
-            f.write(f"#title,{template_title}\n")
-            f.write(f"#author,{template_author}\n")
-            f.write(f"#narrator,{template_narrator}\n")
-            f.write(f"#genre,{template_genre}\n")
-            f.write(f"#year,{template_year}\n")
-            f.write(f"#description,{template_description}\n")
-            f.write(f"#output_path,{output_m4b}\n")
-            f.write("#cover_path,\n")
-            f.write("\n")
-            
-            # Write CSV header
-            writer = csv.writer(f)
-            writer.writerow(['file', 'title'])
-            
-            # Write file entries
-            for file_path in m4b_files:
-                # Make path relative to CSV file directory
-                rel_path = os.path.relpath(file_path, os.path.dirname(output_csv))
-                
-                # First try to get title from file metadata
-                metadata = get_audio_metadata(file_path)
-                metadata_title = metadata.get('title', '').strip() if metadata else ''
-                
-                if metadata_title:
-                    # Use metadata title if available
-                    chapter_title = metadata_title
-                else:
-                    # Fall back to generating chapter title from filename
-                    filename = Path(file_path).stem
-                    # Clean up filename for chapter title
-                    cleaned = re.sub(r'^(chapter|ch|part|pt)[\s\-_]*\d*[\s\-_]*', '', filename, flags=re.IGNORECASE)
-                    cleaned = re.sub(r'^\d+[\s\-_]*', '', cleaned)  # Remove leading numbers
-                    cleaned = cleaned.replace('_', ' ').replace('-', ' ')
-                    cleaned = ' '.join(cleaned.split())  # Normalize whitespace
-                    
-                    if cleaned:
-                        chapter_title = cleaned.title()
-                    else:
-                        chapter_title = filename
-                
-                writer.writerow([rel_path, chapter_title])
+            f.write(buffer.getvalue())
         
-        logger.info(f"✅ CSV template generated: {output_csv}")
-        logger.info(f"   Title: {template_title}")
-        logger.info(f"   Author: {template_author}")
-        logger.info(f"   Narrator: {template_narrator}")
-        logger.info(f"   Year: {template_year}")
-        logger.info(f"   Output: {output_m4b}")
-        logger.info(f"   Files: {len(m4b_files)}")
+        logger.info("✅ CSV template generated: %s", output_csv)
+        logger.info("   Title: %s", template_title)
+        logger.info("   Author: %s", template_author)
+        logger.info("   Narrator: %s", template_narrator)
+        logger.info("   Year: %s", template_year)
+        logger.info("   Output: %s", output_m4b)
+        logger.info("   Files: %s", len(m4b_files))
         
         return True
         
     except Exception as e:
-        logger.error(f"Failed to write CSV file: {e}")
+        logger.error("Failed to write CSV file: %s", e)
         return False
 
 
@@ -486,19 +1106,25 @@ def parse_csv_input(csv_file: str) -> Tuple[List[FileEntry], Dict[str, str]]:
     metadata = {}
     file_list = []
     
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    csv_dir = os.path.dirname(csv_file)
     
-    # Process metadata lines (starting with #)
-    data_start_idx = 0
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if line.startswith('#'):
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        # Process metadata lines (starting with #) until the first data line
+        first_data_line = None
+        for line in f:
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if not stripped.startswith('#'):
+                # Found first non-metadata line
+                first_data_line = line
+                break
+            
             # Parse metadata line: #key,value or #key: value
-            if ',' in line:
-                key, value = line[1:].split(',', 1)
-            elif ':' in line:
-                key, value = line[1:].split(':', 1)
+            if ',' in stripped:
+                key, value = stripped[1:].split(',', 1)
+            elif ':' in stripped:
+                key, value = stripped[1:].split(':', 1)
             else:
                 continue
             
@@ -507,68 +1133,69 @@ def parse_csv_input(csv_file: str) -> Tuple[List[FileEntry], Dict[str, str]]:
             
             if key and value:
                 metadata[key] = value
-            data_start_idx = i + 1
-        elif line and not line.startswith('#'):
-            # Found first non-metadata line
-            break
-    
-    # Process CSV data
-    csv_data = lines[data_start_idx:]
-    if not csv_data:
-        raise ValueError("No data rows found in CSV file")
-    
-    # Filter out empty lines from CSV data
-    csv_data = [line for line in csv_data if line.strip()]
-    
-    if not csv_data:
-        raise ValueError("No non-empty data rows found in CSV file")
-    
-    # Parse CSV data
-    csv_reader = csv.DictReader(csv_data)
-    
-    for row in csv_reader:
-        if 'file' not in row:
-            raise ValueError("CSV must have a 'file' column")
         
-        file_path = row['file'].strip()
-        if not file_path:
-            continue
-            
-        # Convert to absolute path
-        if not os.path.isabs(file_path):
-            # Make relative to CSV file directory
-            csv_dir = os.path.dirname(csv_file)
-            file_path = os.path.join(csv_dir, file_path)
+        if first_data_line is None:
+            raise ValueError("No data rows found in CSV file")
         
-        file_path = os.path.abspath(file_path)
+        # Parse the remaining lines straight from the file, skipping empty ones
+        data_lines = itertools.chain([first_data_line], f)
+        csv_reader = csv.DictReader(line for line in data_lines if line.strip())
         
-        if not os.path.exists(file_path):
-            logger.warning(f"File not found: {file_path}")
-            continue
+        for row in csv_reader:
+            if 'file' not in row:
+                raise ValueError("CSV must have a 'file' column")
             
-        if Path(file_path).suffix.lower() not in {'.m4b', '.m4a'}:
-            logger.warning(f"Skipping non-M4B file: {file_path}")
-            continue
-        
-        title = row.get('title', '').strip()
-        
-        file_entry: FileEntry = {
-            'file': file_path,
-            'title': title
-        }
-        file_list.append(file_entry)
+            file_path = row['file'].strip()
+            if not file_path:
+                continue
+            
+            # Convert to absolute path
+            if not os.path.isabs(file_path):
+                # Make relative to CSV file directory
+                file_path = os.path.join(csv_dir, file_path)
+            
+            file_path = os.path.abspath(file_path)
+            
+            if not os.path.exists(file_path):
+                logger.warning("File not found: %s", file_path)
+                continue
+            
+            if not file_path.lower().endswith(MP4_EXTENSIONS):
+                logger.warning("Skipping non-M4B file: %s", file_path)
+                continue
+            
+            title = row.get('title', '').strip()
+            
+            file_entry: FileEntry = {
+                'file': file_path,
+                'title': title
+            }
+            file_list.append(file_entry)
     
     if not file_list:
         raise ValueError("No valid M4B files found in CSV")
     
-    logger.info(f"Loaded {len(file_list)} files from CSV with {len(metadata)} metadata entries")
+    logger.info("Loaded %s files from CSV with %s metadata entries", len(file_list), len(metadata))
     
     return file_list, metadata
 
 
+def _nearest_existing_dir(path: str) -> str:
+    """Return the closest directory above path that already exists."""
+    directory = os.path.dirname(os.path.abspath(path))
+    while not os.path.isdir(directory):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return directory
+
+
 def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional[str] = None, title: Optional[str] = None,
                      preserve_existing_chapters: bool = False, temp_dir: Optional[str] = None,
-                     csv_file: Optional[str] = None) -> bool:
+                     csv_file: Optional[str] = None, hwaccel: bool = False,
+                     dry_run: bool = False, stream_encoded: bool = False,
+                     cpu_count: Optional[int] = None) -> Union[bool, str]:
     """
     Combine multiple M4B files into a single M4B file with chapters.
     
@@ -579,9 +1206,21 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
         preserve_existing_chapters: If True, preserve existing chapter structure within files
         temp_dir: Optional temporary directory to use (will not be removed if provided)
         csv_file: Optional CSV file with file paths and titles
+        hwaccel: If True, use hardware-accelerated decoding and the fastest available
+                 AAC encoder when files need re-encoding
+        dry_run: If True, stop before running FFmpeg and return the generated
+                 chapter metadata
+        stream_encoded: If True, pipe re-encoded files into the final mux as ADTS
+                        instead of staging them in the temporary directory. Saves
+                        the disk round trip, but ADTS can't trim encoder priming
+                        and padding, so each file gains tens of milliseconds of
+                        silence. Chapters are laid out on the padded lengths, so
+                        they drift later than the source timings file by file
+        cpu_count: CPUs to spread re-encodes over (defaults to all of them)
         
     Returns:
-        True if successful, False otherwise
+        True if successful, False otherwise. A successful dry run returns the
+        FFMETADATA document that would be written instead of True
     """
     if not check_ffmpeg():
         logger.error("FFmpeg is required but not available")
@@ -603,7 +1242,7 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
                 title = csv_metadata['title']
                 
         except (FileNotFoundError, ValueError) as e:
-            logger.error(f"Error reading CSV file: {e}")
+            logger.error("Error reading CSV file: %s", e)
             return False
     else:
         # Find files using glob pattern
@@ -611,15 +1250,16 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
             logger.error("Either input_pattern or csv_file must be provided")
             return False
             
-        matching_files = glob.glob(input_pattern, recursive=True)
-        m4b_files = [os.path.abspath(f) for f in matching_files if Path(f).suffix.lower() in {'.m4b', '.m4a'}]
+        m4b_files = [
+            os.path.abspath(f) for f in iter_matching_files(input_pattern, _MP4_EXTENSION_SET)
+        ]
         
         # Create file_title_list for consistency
         file_title_list: List[FileEntry] = [{'file': f, 'title': ''} for f in m4b_files]
     
     if not m4b_files:
         source = "CSV file" if csv_file else f"pattern: {input_pattern}"
-        logger.error(f"No M4B files found in {source}")
+        logger.error("No M4B files found in %s", source)
         return False
     
     if not output_file:
@@ -629,9 +1269,10 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
     # Sort files naturally (handles numbers correctly)
     m4b_files.sort(key=lambda x: natural_sort_key(os.path.basename(x)))
     
-    logger.info(f"Found {len(m4b_files)} M4B files to combine:")
-    for i, file_path in enumerate(m4b_files, 1):
-        logger.info(f"  {i}. {os.path.basename(file_path)}")
+    logger.info("Found %s M4B files to combine:", len(m4b_files))
+    if logger.isEnabledFor(logging.INFO):
+        for i, file_path in enumerate(m4b_files, 1):
+            logger.info("  %s. %s", i, os.path.basename(file_path))
     
     start_time = time.time()
     
@@ -640,10 +1281,18 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
     files_metadata: List[ProcessedAudioMetadata] = []
     total_duration = 0.0
     
-    for file_path in m4b_files:
-        metadata = get_audio_metadata(file_path)
+    # Map each file to its CSV title; the first entry wins for repeated files
+    csv_title_map = {item['file']: item['title'] for item in reversed(file_title_list)}
+    
+    # Tags are only needed for the first file (book metadata) and for files whose
+    # chapter title is not given in the CSV; the rest get a duration/stream probe
+    csv_titled_files = {f for f, t in csv_title_map.items() if t}
+    stream_info_only = csv_titled_files - {m4b_files[0]}
+    log_durations = logger.isEnabledFor(logging.INFO)
+    
+    for file_path, metadata in zip(m4b_files, probe_files_metadata(m4b_files, stream_info_only)):
         if not metadata:
-            logger.error(f"Could not extract metadata from {file_path}")
+            logger.error("Could not extract metadata from %s", file_path)
             return False
         
         # Create ProcessedAudioMetadata with required fields
@@ -657,94 +1306,132 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
         files_metadata.append(processed_metadata)
         total_duration += duration
         
-        logger.info(f"  {os.path.basename(file_path)}: {format_time(duration)}")
+        if log_durations:
+            logger.info("  %s: %s", os.path.basename(file_path), format_time(duration))
     
     # Check audio compatibility
     compatible = check_audio_compatibility(files_metadata)
     if compatible:
         logger.info("All files have compatible audio parameters - using stream copy")
-        encode_params = ['-c', 'copy']
     else:
         logger.info("Files have different audio parameters - re-encoding to AAC")
-        encode_params = ['-c:a', 'aac', '-b:a', '64k', '-ac', '2']
+    
+    sample_rate = files_metadata[0].get('sample_rate') or '44100'
+    stream_encoded = stream_encoded and not compatible
+    if stream_encoded:
+        # Streamed files keep their encoder priming and frame padding, so lay the
+        # chapters out on the encoded lengths rather than the source durations
+        priming = AAC_ENCODER_PRIMING.get(select_aac_encoder(hwaccel), 1024)
+        total_duration = 0.0
+        for file_meta in files_metadata:
+            file_meta['start_offset'] = total_duration
+            file_meta['duration'] = adts_stream_duration(file_meta['duration'], int(sample_rate), priming)
+            total_duration += file_meta['duration']
     
     # Generate chapters
     logger.info("Generating chapter structure...")
+    if preserve_existing_chapters:
+        files_chapters = extract_files_chapters([m['file_path'] for m in files_metadata])
+    else:
+        files_chapters = itertools.repeat(())
+    
+    # One chapter per file, or the file's own chapters under its title when kept.
+    # Offsets were prefix-summed during the metadata pass
     chapters = []
-    current_time = 0.0
-    
-    for i, file_meta in enumerate(files_metadata, 1):
-        # Get title from CSV if available
-        csv_title = ''
-        if csv_file:
-            # Find matching file in file_title_list
-            for item in file_title_list:
-                if item['file'] == file_meta['file_path']:
-                    csv_title = item['title']
-                    break
-        
-        if preserve_existing_chapters:
-            # Extract existing chapters and offset them
-            existing_chapters = extract_existing_chapters(file_meta['file_path'])
-            if existing_chapters:
-                logger.info(f"  File {i} has {len(existing_chapters)} existing chapters")
-                for chapter in existing_chapters:
-                    base_title = csv_title or derive_chapter_title(file_meta['file_path'], i, file_meta.get('title', ''))
-                    chapters.append({
-                        'title': f"{base_title} - {chapter['title']}",
-                        'start': current_time + chapter['start'],
-                        'end': current_time + chapter['end']
-                    })
-            else:
-                # No existing chapters, create one for the whole file
-                chapter_title = csv_title or derive_chapter_title(file_meta['file_path'], i, file_meta.get('title', ''))
-                chapters.append({
-                    'title': chapter_title,
-                    'start': current_time,
-                    'end': current_time + file_meta['duration']
-                })
+    for i, (file_meta, existing_chapters) in enumerate(zip(files_metadata, files_chapters), 1):
+        start = file_meta['start_offset']
+        file_title = (
+            csv_title_map.get(file_meta['file_path'])
+            or derive_chapter_title(file_meta['file_path'], i, file_meta.get('title', ''))
+        )
+        
+        if existing_chapters:
+            logger.info("  File %s has %s existing chapters", i, len(existing_chapters))
+            chapters.extend(
+                {
+                    'title': f"{file_title} - {chapter['title']}",
+                    'start': start + chapter['start'],
+                    'end': start + chapter['end']
+                }
+                for chapter in existing_chapters
+            )
         else:
-            # Create one chapter per file
-            chapter_title = csv_title or derive_chapter_title(file_meta['file_path'], i, file_meta.get('title', ''))
             chapters.append({
-                'title': chapter_title,
-                'start': current_time,
-                'end': current_time + file_meta['duration']
+                'title': file_title,
+                'start': start,
+                'end': start + file_meta['duration']
             })
-        
-        current_time += file_meta['duration']
-    
-    logger.info(f"Created {len(chapters)} chapters, total duration: {format_time(total_duration)}")
     
+    logger.info("Created %s chapters, total duration: %s", len(chapters), format_time(total_duration))
+    
+    # Determine output metadata
+    output_metadata: BookMetadata = {
+        'title': title or csv_metadata.get('title') or files_metadata[0].get('album', '') or 'Combined Audiobook',
+        'artist': csv_metadata.get('author') or files_metadata[0].get('artist', ''),
+        'album': title or csv_metadata.get('title') or files_metadata[0].get('album', '') or 'Combined Audiobook',
+        'author': csv_metadata.get('author', ''),
+        'narrator': csv_metadata.get('narrator', ''),
+        'genre': csv_metadata.get('genre', 'Audiobook'),
+        'year': csv_metadata.get('year', ''),
+        'description': csv_metadata.get('description', '')
+    }
+        
     # Create or use temporary directory for intermediate files
     if temp_dir:
         # Use provided temp directory and don't remove it
         temp_dir = os.path.abspath(temp_dir)
         os.makedirs(temp_dir, exist_ok=True)
         temp_context = nullcontext(temp_dir)
-        logger.info(f"Using provided temporary directory: {temp_dir}")
-    else:
-        # Create temporary directory that will be cleaned up
+        logger.info("Using provided temporary directory: %s", temp_dir)
+    elif dry_run or compatible or stream_encoded:
+        # Only the small metadata and cover files are written, so the system temp dir is fine
         temp_context = tempfile.TemporaryDirectory()
         logger.info("Creating temporary directory...")
+    else:
+        # Staged re-encodes are as large as the book, so keep them on the output's
+        # filesystem rather than a possibly RAM-backed /tmp. Using the nearest
+        # existing ancestor leaves creating the output directory until the final mux
+        temp_context = tempfile.TemporaryDirectory(
+            dir=_nearest_existing_dir(output_file), prefix='.m4b_tmp_'
+        )
+        logger.info("Creating temporary directory...")
     
     with temp_context as use_temp_dir:
+        if dry_run:
+            # Hand back what would be written without running FFmpeg
+            metadata_file = create_chapter_metadata(chapters, use_temp_dir, output_metadata)
+            logger.info("Dry run: skipped combining %s files into %s", len(m4b_files), output_file)
+            return Path(metadata_file).read_text(encoding='utf-8')
+        
         logger.info("Creating temporary files...")
         
-        # Create concat file
-        concat_file = create_concat_file(m4b_files, use_temp_dir)
-        
-        # Determine output metadata
-        output_metadata: BookMetadata = {
-            'title': title or csv_metadata.get('title') or files_metadata[0].get('album', '') or 'Combined Audiobook',
-            'artist': csv_metadata.get('author') or files_metadata[0].get('artist', ''),
-            'album': title or csv_metadata.get('title') or files_metadata[0].get('album', '') or 'Combined Audiobook',
-            'author': csv_metadata.get('author', ''),
-            'narrator': csv_metadata.get('narrator', ''),
-            'genre': csv_metadata.get('genre', 'Audiobook'),
-            'year': csv_metadata.get('year', ''),
-            'description': csv_metadata.get('description', '')
-        }
+        # Incompatible files are re-encoded in parallel, either streamed straight
+        # into the final mux or staged as intermediates joined with stream copy
+        concat_list: Optional[bytes] = None
+        if stream_encoded:
+            input_args = ['-f', 'aac', '-i', 'pipe:0']
+        else:
+            concat_inputs = m4b_files
+            if not compatible:
+                concat_inputs = reencode_files_for_concat(
+                    m4b_files, os.path.join(use_temp_dir, 'enc'), sample_rate, hwaccel, cpu_count
+                )
+                if concat_inputs is None:
+                    return False
+            
+            if temp_dir:
+                # Keep the list on disk alongside the other kept temporary files
+                concat_file = create_concat_file(concat_inputs, use_temp_dir)
+                input_args = ['-f', 'concat', '-safe', '0', '-i', concat_file]
+            else:
+                # Hand FFmpeg the list on stdin rather than writing it out
+                concat_list = format_concat_list(concat_inputs, as_urls=True).encode('utf-8')
+                input_args = [
+                    '-f', 'concat', '-safe', '0', '-protocol_whitelist', 'file,pipe', '-i', 'pipe:0'
+                ]
+            
+            # Start reading the inputs while the rest is set up
+            prefetch_files(concat_inputs)
         
         # Create metadata file with chapters
         metadata_file = create_chapter_metadata(chapters, use_temp_dir, output_metadata)
@@ -759,9 +1446,9 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
                 # Download cover art from URL
                 cover_file = download_cover_art(cover_path, use_temp_dir)
                 if cover_file:
-                    logger.info(f"Using downloaded cover art: {cover_file}")
+                    logger.info("Using downloaded cover art: %s", cover_file)
                 else:
-                    logger.warning(f"Failed to download cover art from: {cover_path}")
+                    logger.warning("Failed to download cover art from: %s", cover_path)
             else:
                 # Handle local file path
                 if not os.path.isabs(cover_path) and csv_file:
@@ -772,50 +1459,29 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
                 cover_path = os.path.abspath(cover_path)
                 if os.path.exists(cover_path):
                     cover_file = cover_path
-                    logger.info(f"Using cover art: {cover_path}")
+                    logger.info("Using cover art: %s", cover_path)
                 else:
-                    logger.warning(f"Cover art file not found: {cover_path}")
+                    logger.warning("Cover art file not found: %s", cover_path)
         
         # Ensure output directory exists
         output_file = os.path.abspath(output_file)
         ensure_output_directory(output_file)
         
-        # First step: Combine audio files
-        logger.info("Combining audio files...")
-        temp_combined = os.path.join(use_temp_dir, 'combined_temp.m4b')
-        
-        cmd = [
-            'ffmpeg', '-f', 'concat', '-safe', '0',
-            '-i', concat_file
-        ] + encode_params + [
-            '-f', 'mp4',
-            '-y',  # Overwrite output
-            temp_combined
-        ]
-        
-        try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
-            logger.info("Audio files combined successfully")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to combine audio files: {e.stderr}")
-            return False
-        
-        # Second step: Add metadata and chapters
-        logger.info("Adding chapter metadata...")
+        # Combine audio, chapters, metadata and cover art in a single pass so the
+        # audiobook is only written to disk once
+        logger.info("Combining audio files and adding chapter metadata...")
         
-        cmd = [
-            'ffmpeg', '-i', temp_combined,
-            '-i', metadata_file
-        ]
+        # One pass muxes the audio, chapters and cover; -nostats keeps stderr to
+        # the messages worth reporting if it fails
+        cmd = [resolve_binary('ffmpeg'), '-nostats'] + input_args + ['-i', metadata_file]
         
         # Add cover art if provided
         if cover_file:
             cmd.extend(['-i', cover_file])
-            cmd.extend(['-map', '0', '-map', '2', '-map_metadata', '1'])
+            cmd.extend(['-map', '0', '-map', '2'])
             cmd.extend(['-disposition:v:0', 'attached_pic'])
-        else:
-            cmd.extend(['-map_metadata', '1'])
         
+        cmd.extend(['-map_metadata', '1', '-map_chapters', '1'])
         cmd.extend([
             '-c', 'copy',
             '-f', 'mp4',
@@ -823,23 +1489,69 @@ def combine_m4b_files(input_pattern: Optional[str] = None, output_file: Optional
             output_file
         ])
         
-        try:
-            subprocess.run(cmd, capture_output=True, text=True, check=True)
-            logger.info("Metadata and chapters added successfully")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed to add metadata: {e.stderr}")
-            return False
+        if stream_encoded:
+            if not _run_with_encoded_input(cmd, m4b_files, sample_rate, hwaccel, cpu_count):
+                return False
+        else:
+            try:
+                subprocess.run(cmd, input=concat_list, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.PIPE, check=True)
+            except subprocess.CalledProcessError as e:
+                logger.error("Failed to combine audio files: %s", e.stderr.decode('utf-8', 'replace'))
+                return False
+        logger.info("Audio files combined with metadata and chapters successfully")
         
         # Verify output file
-        if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-            file_size_mb = os.path.getsize(output_file) / (1024 * 1024)
+        output_size = file_size(output_file)
+        if output_size > 0:
+            file_size_mb = output_size / (1024 * 1024)
+            drop_page_cache(output_file)
             total_time = time.time() - start_time
             logger.info(
-                f"✅ Successfully created {output_file} "
-                f"({file_size_mb:.1f}MB) with {len(chapters)} chapters "
-                f"in {format_time(total_time)}"
+                "✅ Successfully created %s (%.1fMB) with %d chapters in %s",
+                output_file, file_size_mb, len(chapters), format_time(total_time)
             )
             return True
         else:
             logger.error("Output file was not created or is empty")
-            return False
\ No newline at end of file
+            return False
+
+
+def combine_many(csv_files: List[str], max_workers: int = 1, preserve_existing_chapters: bool = False,
+                 hwaccel: bool = False, dry_run: bool = False,
+                 stream_encoded: bool = False) -> Dict[str, Union[bool, str]]:
+    """
+    Combine several books, one per CSV file, running up to max_workers at once.
+    
+    Books are independent, so they run side by side; the CPUs are split evenly
+    between the books running at once, so their re-encodes don't oversubscribe
+    the machine. Every CSV must name its own output_path.
+    
+    Args:
+        csv_files: CSV files describing the books to combine
+        max_workers: Maximum number of books combined concurrently, 0 for one per CPU
+        preserve_existing_chapters: If True, preserve existing chapter structure within files
+        hwaccel: If True, use hardware-accelerated decoding when files need re-encoding
+        dry_run: If True, return each book's chapter metadata without running FFmpeg
+        stream_encoded: If True, pipe re-encoded files into the final mux instead of staging them
+        
+    Returns:
+        Dictionary mapping each CSV file to combine_m4b_files's result for its book
+    """
+    if max_workers == 0:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(csv_files)))
+    
+    combine = functools.partial(
+        combine_m4b_files,
+        preserve_existing_chapters=preserve_existing_chapters,
+        hwaccel=hwaccel,
+        dry_run=dry_run,
+        stream_encoded=stream_encoded,
+        cpu_count=max(1, (os.cpu_count() or 1) // max_workers)
+    )
+    
+    logger.info("Combining %s books with %s parallel job(s)", len(csv_files), max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(lambda csv_file: combine(csv_file=csv_file), csv_files)
+        return dict(zip(csv_files, results))
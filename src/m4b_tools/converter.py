@@ -6,16 +6,24 @@ while preserving directory structure and supporting batch operations.
 """
 
 import os
-import glob
+import functools
 import time
-import threading
 from pathlib import Path
-from typing import Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import subprocess
 import logging
 
-from .utils import check_ffmpeg, format_time, ensure_output_directory
+from .utils import (
+    check_ffmpeg, format_time, ensure_output_directory, file_size, get_audio_stream_info,
+    iter_matching_files, resolve_binary
+)
+
+try:
+    # Optional: decode and encode in-process instead of spawning ffmpeg per file
+    import av
+except ImportError:
+    av = None
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -23,14 +31,80 @@ logger = logging.getLogger(__name__)
 # Supported audio formats
 SUPPORTED_FORMATS = {'.mp3', '.flac', '.m4a', '.aac', '.ogg', '.wav', '.wma'}
 
+# Inputs that may already hold AAC audio, which can be remuxed without re-encoding
+AAC_SOURCE_EXTENSIONS = ('.m4a', '.aac')
+
+# Minimum seconds between text progress lines during batch conversion
+PROGRESS_LOG_INTERVAL = 1.0
+
+# Threads per FFmpeg process; parallelism comes from running several files at once
+DEFAULT_FFMPEG_THREADS = 2
+
+# Most files encoded by a single FFmpeg process when PyAV isn't used
+FFMPEG_BATCH_SIZE = 8
+
+
+def _use_pyav() -> bool:
+    """
+    Check whether conversions run in-process with PyAV instead of the ffmpeg CLI.
+    
+    PyAV versions that can't read chapters would silently drop them, so those
+    are treated as unavailable.
+    """
+    return av is not None and hasattr(av.container.InputContainer, 'chapters')
+
+
+def _convert_with_pyav(input_file: str, output_file: str, bitrate: int = 64000,
+                       ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS) -> None:
+    """
+    Convert an audio file to M4B in-process using PyAV.
+    
+    Mirrors the ffmpeg command used by convert_to_m4b: AAC at the given bitrate,
+    keeping the source sample rate and channel layout, with video dropped and
+    container tags and chapters copied.
+    
+    Only call this when _use_pyav() is True.
+    
+    Raises:
+        av.FFmpegError or OSError if the file can't be converted
+    """
+    with av.open(input_file) as in_container:
+        in_stream = in_container.streams.audio[0]
+        in_stream.thread_count = ffmpeg_threads
+        layout = in_stream.layout.name
+        
+        with av.open(output_file, 'w', options={'movflags': '+faststart'}) as out_container:
+            out_container.metadata.update(in_container.metadata)
+            out_container.set_chapters(in_container.chapters())
+            out_stream = out_container.add_stream('aac', rate=in_stream.rate, layout=layout)
+            out_stream.bit_rate = bitrate
+            out_stream.thread_count = ffmpeg_threads
+            
+            # The AAC encoder only accepts planar float samples
+            resampler = av.AudioResampler(format='fltp', layout=layout, rate=in_stream.rate)
+            for frame in in_container.decode(in_stream):
+                for resampled in resampler.resample(frame):
+                    out_container.mux(out_stream.encode(resampled))
+            
+            # Flush samples buffered in the resampler and encoder
+            for resampled in resampler.resample(None):
+                out_container.mux(out_stream.encode(resampled))
+            out_container.mux(out_stream.encode(None))
+
 
-def convert_to_m4b(input_file: str, output_file: str) -> bool:
+def convert_to_m4b(input_file: str, output_file: str,
+                   ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS) -> bool:
     """
     Convert an audio file to M4B format using FFmpeg.
     
+    When PyAV is installed, files that need re-encoding are converted
+    in-process with the FFmpeg libraries bundled with PyAV instead of the
+    ffmpeg binary, falling back to the binary if PyAV fails.
+    
     Args:
         input_file: Path to the input audio file
         output_file: Path to the output M4B file
+        ffmpeg_threads: Number of threads the FFmpeg process may use
         
     Returns:
         True if conversion was successful, False otherwise
@@ -39,23 +113,52 @@ def convert_to_m4b(input_file: str, output_file: str) -> bool:
         # Ensure output directory exists
         ensure_output_directory(output_file)
         
+        # AAC sources only need a remux; re-encoding would cost CPU and quality
+        copy_audio = (
+            input_file.lower().endswith(AAC_SOURCE_EXTENSIONS)
+            and get_audio_stream_info(input_file).get('codec') == 'aac'
+        )
+        
         # FFmpeg command for M4B conversion
-        cmd = [
-            'ffmpeg', '-i', input_file,
-            '-b:a', '64k',  # Audio bitrate (good for audiobooks)
-            '-vn',          # Disable video
-            '-y',           # Overwrite output file
-            output_file
-        ]
+        if copy_audio:
+            cmd = [
+                resolve_binary('ffmpeg'), '-nostats', '-i', input_file,
+                '-c:a', 'copy',
+                '-vn',          # Disable video
+                '-movflags', '+faststart',
+                '-y',           # Overwrite output file
+                output_file
+            ]
+        else:
+            cmd = [
+                resolve_binary('ffmpeg'), '-nostats', '-i', input_file,
+                '-b:a', '64k',  # Audio bitrate (good for audiobooks)
+                '-vn',          # Disable video
+                '-threads', str(ffmpeg_threads),
+                '-movflags', '+faststart',
+                '-y',           # Overwrite output file
+                output_file
+            ]
         
         logger.info(f"Converting: {os.path.basename(input_file)} -> {os.path.basename(output_file)}")
-        conversion_start = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        conversion_time = time.time() - conversion_start
+        conversion_start = time.monotonic()
+        converted = False
+        if _use_pyav() and not copy_audio:
+            try:
+                _convert_with_pyav(input_file, output_file, ffmpeg_threads=ffmpeg_threads)
+                converted = True
+            except (av.FFmpegError, OSError) as e:
+                # Formats PyAV can't handle still go through the ffmpeg CLI
+                logger.debug(f"PyAV could not convert {input_file}, using ffmpeg: {e}")
+        if not converted:
+            # stderr is only read, and decoded, if FFmpeg fails
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+        conversion_time = time.monotonic() - conversion_start
         
         # Verify the output file was created
-        if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-            file_size_mb = os.path.getsize(output_file) / (1024 * 1024)
+        output_size = file_size(output_file)
+        if output_size > 0:
+            file_size_mb = output_size / (1024 * 1024)
             logger.info(
                 f"✅ Converted {os.path.basename(output_file)} "
                 f"({file_size_mb:.1f}MB) in {format_time(conversion_time)}"
@@ -66,74 +169,211 @@ def convert_to_m4b(input_file: str, output_file: str) -> bool:
             return False
             
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg error converting {input_file}: {e.stderr}")
+        stderr = e.stderr.decode(errors='replace') if e.stderr else ''
+        logger.error(f"FFmpeg error converting {input_file}: {stderr}")
         return False
     except Exception as e:
         logger.error(f"Unexpected error converting {input_file}: {str(e)}")
         return False
 
 
-def _process_single_file(input_file: str, output_base_path: Path, preserve_structure: bool,
-                        base_input_path: Optional[str], base_path: Optional[Path], 
-                        glob_pattern: str) -> Tuple[bool, str]:
+def iter_audio_files(pattern: str) -> Iterator[str]:
     """
-    Process a single audio file conversion.
+    Yield supported audio files matching a glob pattern.
     
-    Returns:
-        Tuple of (success, input_file_path)
+    See utils.iter_matching_files for how the pattern is matched.
+    
+    Args:
+        pattern: Glob pattern, optionally using "**" for recursion
+        
+    Yields:
+        Paths of matching files with a supported audio extension
     """
+    return iter_matching_files(pattern, SUPPORTED_FORMATS)
+
+
+def _init_worker_logging(level: int) -> None:
+    """Configure logging in worker processes that don't inherit the parent's handlers."""
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=level,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+
+def _flat_output_path(output_base_path: Path, input_file: str) -> Path:
+    """Place the output directly in the output base directory."""
+    return output_base_path / (os.path.splitext(os.path.basename(input_file))[0] + '.m4b')
+
+
+def _relative_output_path(output_base_path: Path, reference: Path, warn_outside: bool,
+                          input_file: str) -> Path:
+    """Mirror the input's location under reference into the output base directory."""
+    # Inputs usually start with the reference exactly as spelled, which can be
+    # sliced off without building a Path; anything else takes the general route
+    prefix = os.path.join(str(reference), '')
+    if input_file.startswith(prefix):
+        relative_file = input_file[len(prefix):]
+        if not os.path.isabs(relative_file):
+            return output_base_path / (os.path.splitext(relative_file)[0] + '.m4b')
+    
     input_path = Path(input_file)
+    try:
+        relative_path = input_path.relative_to(reference)
+    except ValueError:
+        # If file is not under the reference directory, use filename only
+        if warn_outside:
+            logger.warning(f"File {input_file} is not under base_input_path {reference}, using filename only")
+        relative_path = Path(input_path.name)
+    return output_base_path / relative_path.with_suffix('.m4b')
+
+
+def _make_output_path_resolver(output_base_path: Path, preserve_structure: bool,
+                               base_path: Optional[Path], glob_pattern: str) -> Callable[[str], Path]:
+    """
+    Decide once how output paths are derived, instead of per file.
     
+    Returns:
+        Function mapping an input file path to its M4B output path
+    """
     if preserve_structure:
-        # Determine relative path based on base_input_path or pattern
-        if base_input_path and base_path:
+        if base_path:
             # Use base_input_path as the reference point
-            try:
-                relative_path = input_path.relative_to(base_path)
-            except ValueError:
-                # If file is not under base_path, use filename only
-                logger.warning(f"File {input_file} is not under base_input_path {base_input_path}, using filename only")
-                relative_path = input_path.name
-        else:
-            # Legacy behavior: derive base from glob pattern
-            if '**' in glob_pattern:
-                pattern_base = glob_pattern.split('**')[0].rstrip('/')
-                if pattern_base:
-                    try:
-                        relative_path = input_path.relative_to(pattern_base)
-                    except ValueError:
-                        # If relative_to fails, use the filename only
-                        relative_path = input_path.name
-                else:
-                    # Pattern starts with **, use absolute path relative to cwd
-                    try:
-                        relative_path = input_path.relative_to(Path.cwd())
-                    except ValueError:
-                        relative_path = input_path.name
-            else:
-                # Simple pattern, just use filename
-                relative_path = input_path.name
+            return functools.partial(_relative_output_path, output_base_path, base_path, True)
         
-        # Create output path with M4B extension
-        output_path = output_base_path / Path(relative_path).with_suffix('.m4b')
-    else:
-        # Flat structure - all files in output base directory
-        output_filename = input_path.stem + '.m4b'
-        output_path = output_base_path / output_filename
+        # Legacy behavior: derive base from glob pattern
+        if '**' in glob_pattern:
+            pattern_base = glob_pattern.split('**')[0].rstrip('/')
+            # Pattern starts with **, use paths relative to cwd
+            reference = Path(pattern_base) if pattern_base else Path.cwd()
+            return functools.partial(_relative_output_path, output_base_path, reference, False)
     
-    # Skip if output file already exists
-    if output_path.exists():
-        logger.info(f"Skipping {input_file} - output already exists")
-        return False, input_file
+    # Flat structure, or a simple pattern: just use the filename
+    return functools.partial(_flat_output_path, output_base_path)
+
+
+def _make_existing_output_check(output_base_path: Path) -> Callable[[Path], bool]:
+    """
+    Build a check for outputs that already exist, from one walk of the output tree.
     
-    # Convert the file
-    success = convert_to_m4b(str(input_path), str(output_path))
-    return success, input_file
+    The walk doesn't follow symlinks, so it can't loop; outputs in directories
+    it didn't list, such as ones reached through a symlink, are checked with a
+    stat instead.
+    """
+    existing = set()
+    walked = set()
+    for directory, _, filenames in os.walk(str(output_base_path)):
+        walked.add(directory)
+        for filename in filenames:
+            if filename.endswith('.m4b'):
+                existing.add(os.path.join(directory, filename))
+    
+    def output_exists(output_path: Path) -> bool:
+        path = str(output_path)
+        if path in existing:
+            return True
+        return os.path.dirname(path) not in walked and output_path.exists()
+    
+    return output_exists
+
+
+def convert_batch_to_m4b(jobs: Sequence[Tuple[str, str]],
+                         ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS) -> List[bool]:
+    """
+    Convert several audio files to M4B format with one FFmpeg process.
+    
+    Each input is mapped to its own output, with its own tags and chapters, so
+    the results match convert_to_m4b while FFmpeg's startup and encoder setup
+    are paid once per batch. Files that may only need a remux, and every file
+    of a batch that FFmpeg fails on, are converted one at a time with
+    convert_to_m4b.
+    
+    Args:
+        jobs: Sequence of (input_file, output_file) pairs
+        ffmpeg_threads: Number of threads the FFmpeg process may use
+        
+    Returns:
+        List of success flags, in the same order as jobs
+    """
+    results = [False] * len(jobs)
+    batched = [
+        index for index, (input_file, _) in enumerate(jobs)
+        if not input_file.lower().endswith(AAC_SOURCE_EXTENSIONS)
+    ]
+    if _use_pyav() or len(batched) < 2:
+        # PyAV already converts in-process, so there's no startup cost to share
+        batched = []
+    
+    converted: Set[int] = set()
+    if batched:
+        cmd = [resolve_binary('ffmpeg'), '-nostats']
+        for index in batched:
+            cmd += ['-i', jobs[index][0]]
+        for input_index, index in enumerate(batched):
+            ensure_output_directory(jobs[index][1])
+            cmd += [
+                '-map', f'{input_index}:a:0',
+                '-map_metadata', str(input_index),
+                '-map_chapters', str(input_index),
+                '-b:a', '64k',
+                '-threads', str(ffmpeg_threads),
+                '-movflags', '+faststart',
+                '-y', jobs[index][1]
+            ]
+        
+        logger.info(f"Converting {len(batched)} files with one FFmpeg process")
+        conversion_start = time.monotonic()
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        conversion_time = time.monotonic() - conversion_start
+        if result.returncode == 0:
+            for index in batched:
+                output_file = jobs[index][1]
+                file_size_mb = file_size(output_file) / (1024 * 1024)
+                if file_size_mb > 0:
+                    logger.info(f"✅ Converted {os.path.basename(output_file)} ({file_size_mb:.1f}MB)")
+                    results[index] = True
+                else:
+                    logger.error(f"Output file not created or is empty: {output_file}")
+            logger.info(f"Converted batch of {len(batched)} files in {format_time(conversion_time)}")
+            converted.update(batched)
+        else:
+            # One bad input fails the whole batch, and any output may have been cut
+            # short mid-write, so discard them all and convert each file on its own
+            logger.warning(
+                "Batch conversion failed, converting files one at a time: "
+                + result.stderr.decode(errors='replace')
+            )
+            for index in batched:
+                try:
+                    os.remove(jobs[index][1])
+                except FileNotFoundError:
+                    pass
+    
+    for index, (input_file, output_file) in enumerate(jobs):
+        if index not in converted:
+            results[index] = convert_to_m4b(input_file, output_file, ffmpeg_threads)
+    return results
+
+
+def _process_batch(jobs: Sequence[Tuple[str, Path]],
+                   ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS) -> List[Tuple[bool, str]]:
+    """
+    Process a batch of audio file conversions.
+    
+    Returns:
+        List of (success, input_file_path) tuples
+    """
+    results = convert_batch_to_m4b(
+        [(input_file, str(output_path)) for input_file, output_path in jobs], ffmpeg_threads
+    )
+    return [(success, input_file) for success, (input_file, _) in zip(results, jobs)]
 
 
 def convert_all_to_m4b(glob_pattern: str, output_base_dir: str, 
                       preserve_structure: bool = True, show_progress_bar: bool = False,
-                      base_input_path: Optional[str] = None, max_workers: int = 1) -> Tuple[int, int]:
+                      base_input_path: Optional[str] = None, max_workers: int = 1,
+                      ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS,
+                      dry_run: bool = False) -> Tuple[int, int]:
     """
     Convert all audio files matching a glob pattern to M4B format.
     
@@ -144,10 +384,14 @@ def convert_all_to_m4b(glob_pattern: str, output_base_dir: str,
         show_progress_bar: Whether to show a visual progress bar (requires tqdm)
         base_input_path: Optional base input path for determining relative structure.
                         If provided, the glob pattern is treated as relative to this path
-        max_workers: Maximum number of concurrent FFmpeg processes (default: 1)
+        max_workers: Maximum number of concurrent FFmpeg processes (default: 1).
+                    0 picks one worker per ffmpeg_threads CPU cores
+        ffmpeg_threads: Number of threads each FFmpeg process may use
+        dry_run: If True, log each input and its output path without converting
         
     Returns:
-        Tuple of (successful_conversions, total_files)
+        Tuple of (successful_conversions, total_files). For a dry run, the first
+        item is the number of files that would be converted
     """
     if not check_ffmpeg():
         logger.error("FFmpeg is required but not available")
@@ -166,14 +410,8 @@ def convert_all_to_m4b(glob_pattern: str, output_base_dir: str,
         full_pattern = glob_pattern
         base_path = None
     
-    # Find all matching files
-    matching_files = sorted(glob.glob(full_pattern, recursive=True))
-    
-    # Filter for supported audio formats
-    audio_files = [
-        f for f in matching_files 
-        if Path(f).suffix.lower() in SUPPORTED_FORMATS
-    ]
+    # Find all matching files with a supported audio format
+    audio_files = sorted(iter_audio_files(full_pattern))
     
     if not audio_files:
         logger.warning(f"No supported audio files found matching pattern: {glob_pattern}")
@@ -181,6 +419,39 @@ def convert_all_to_m4b(glob_pattern: str, output_base_dir: str,
     
     logger.info(f"Found {len(audio_files)} audio files to convert")
     
+    # Work out every output path up front, checking for existing outputs against
+    # one listing of the output tree instead of a stat per file
+    output_base_path = Path(output_base_dir)
+    resolve_output_path = _make_output_path_resolver(
+        output_base_path, preserve_structure, base_path, glob_pattern
+    )
+    output_exists = _make_existing_output_check(output_base_path)
+    planned: List[Tuple[str, Path]] = []
+    skipped: List[str] = []
+    duplicates: List[str] = []
+    planned_outputs: Dict[str, str] = {}
+    for input_file in audio_files:
+        output_path = resolve_output_path(input_file)
+        if str(output_path) in planned_outputs:
+            # Converting both would have the second overwrite the first
+            logger.warning(
+                f"Skipping {input_file} - {planned_outputs[str(output_path)]} "
+                f"already converts to {output_path}"
+            )
+            duplicates.append(input_file)
+        elif output_exists(output_path):
+            skipped.append(input_file)
+        else:
+            planned_outputs[str(output_path)] = input_file
+            planned.append((input_file, output_path))
+    
+    if dry_run:
+        for input_file, output_path in planned:
+            logger.info(f"Would convert: {input_file} -> {output_path}")
+        for input_file in skipped:
+            logger.info(f"Skipping {input_file} - output already exists")
+        return len(planned), len(audio_files)
+    
     # Try to import tqdm for progress bar if requested
     progress_bar = None
     if show_progress_bar:
@@ -192,98 +463,109 @@ def convert_all_to_m4b(glob_pattern: str, output_base_dir: str,
             show_progress_bar = False
     
     # Create output base directory
-    output_base_path = Path(output_base_dir)
     output_base_path.mkdir(parents=True, exist_ok=True)
     
     total_files = len(audio_files)
-    start_time = time.time()
+    start_time = time.monotonic()
+    
+    if max_workers == 0:
+        # Fill the machine without oversubscribing it
+        max_workers = max(1, (os.cpu_count() or 1) // ffmpeg_threads)
     
     logger.info(f"Starting conversion of {total_files} files with {max_workers} worker(s)...")
     
-    # Thread-safe counter for successful conversions
-    success_lock = threading.Lock()
+    # Results are all collected on this thread, so the counters need no locking
     successful_conversions = 0
     completed_files = 0
+    last_progress_log = 0.0
     
-    def update_counters(success: bool):
-        nonlocal successful_conversions, completed_files
-        with success_lock:
-            completed_files += 1
-            if success:
-                successful_conversions += 1
-    
-    def update_progress(input_file: str):
-        """Update progress bar and log progress information."""
-        # Update progress bar if available
-        if progress_bar:
-            with success_lock:  # Ensure thread-safe access to counters
-                progress_bar.update(1)
-                progress_bar.set_postfix({
-                    'Success': successful_conversions,
-                    'File': os.path.basename(input_file)[:30]
-                })
+    def update_bar(input_file: str):
+        """Advance the progress bar, which keeps its own timing and rate."""
+        progress_bar.update(1)
+        progress_bar.set_postfix_str(
+            f"Success={successful_conversions}, File={os.path.basename(input_file)[:30]}"
+        )
+    
+    def log_progress(input_file: str):
+        """Log progress and time estimates, at most once per interval plus the last file."""
+        nonlocal last_progress_log
+        now = time.monotonic()
+        if now - last_progress_log < PROGRESS_LOG_INTERVAL and completed_files < total_files:
+            return
+        last_progress_log = now
         
-        # Calculate progress and time estimates (only show if no progress bar)
-        if not show_progress_bar:
-            elapsed_time = time.time() - start_time
-            
-            with success_lock:  # Ensure thread-safe access to counters
-                current_completed = completed_files
-                current_successful = successful_conversions
-            
-            if current_completed > 0:
-                avg_time_per_file = elapsed_time / current_completed
-                remaining_files = total_files - current_completed
-                estimated_time_remaining = avg_time_per_file * remaining_files
-                
-                progress_percent = (current_completed / total_files) * 100
-                
-                logger.info(
-                    f"Progress: {current_completed}/{total_files} ({progress_percent:.1f}%) | "
-                    f"Successful: {current_successful} | "
-                    f"Elapsed: {format_time(elapsed_time)} | "
-                    f"ETA: {format_time(estimated_time_remaining)}"
-                )
+        elapsed_time = now - start_time
+        estimated_time_remaining = elapsed_time * (total_files - completed_files) / completed_files
+        progress_percent = completed_files * 100 / total_files
+        
+        logger.info(
+            f"Progress: {completed_files}/{total_files} ({progress_percent:.1f}%) | "
+            f"Successful: {successful_conversions} | "
+            f"Elapsed: {format_time(elapsed_time)} | "
+            f"ETA: {format_time(estimated_time_remaining)}"
+        )
+    
+    # Pick the progress reporter once rather than branching on every file
+    update_progress = update_bar if progress_bar else log_progress
+    
+    def on_complete(success: bool, input_file: str):
+        """Count a finished file and report progress."""
+        nonlocal successful_conversions, completed_files
+        completed_files += 1
+        successful_conversions += success
+        update_progress(input_file)
+    
+    for input_file in skipped:
+        logger.info(f"Skipping {input_file} - output already exists")
+        on_complete(False, input_file)
+    for input_file in duplicates:
+        on_complete(False, input_file)
+    
+    # Without PyAV each FFmpeg process takes a batch of files, keeping at least
+    # one batch per worker so small runs still spread across all of them.
+    # Progress then advances once per finished batch, so FFMPEG_BATCH_SIZE also
+    # bounds how coarse the progress steps get
+    if not _use_pyav():
+        batch_size = max(1, min(FFMPEG_BATCH_SIZE, -(-len(planned) // max_workers)))
+    else:
+        batch_size = 1
+    batches = [planned[i:i + batch_size] for i in range(0, len(planned), batch_size)]
     
     if max_workers == 1:
         # Single-threaded execution
-        for input_file in audio_files:
-            success, _ = _process_single_file(
-                input_file, output_base_path, preserve_structure,
-                base_input_path, base_path, glob_pattern
-            )
-            
-            update_counters(success)
-            update_progress(input_file)
+        for batch in batches:
+            for success, input_file in _process_batch(batch, ffmpeg_threads):
+                on_complete(success, input_file)
     else:
-        # Multi-threaded execution
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Multi-process execution, so per-file work doesn't contend for the GIL
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker_logging,
+            initargs=(logging.getLogger().getEffectiveLevel(),)
+        ) as executor:
             # Submit all tasks
-            future_to_file = {
-                executor.submit(
-                    _process_single_file,
-                    input_file, output_base_path, preserve_structure,
-                    base_input_path, base_path, glob_pattern
-                ): input_file for input_file in audio_files
+            future_to_batch = {
+                executor.submit(_process_batch, batch, ffmpeg_threads): batch
+                for batch in batches
             }
             
             # Process completed tasks
-            for future in as_completed(future_to_file):
-                input_file = future_to_file[future]
+            for future in as_completed(future_to_batch):
+                batch = future_to_batch[future]
                 try:
-                    success, _ = future.result()
-                    update_counters(success)
+                    results = future.result()
                 except Exception as exc:
-                    logger.error(f"File {input_file} generated an exception: {exc}")
-                    update_counters(False)
+                    logger.error(f"Batch starting with {batch[0][0]} generated an exception: {exc}")
+                    results = [(False, input_file) for input_file, _ in batch]
                 
-                update_progress(input_file)
+                for success, input_file in results:
+                    on_complete(success, input_file)
     
     # Close progress bar if it was used
     if progress_bar:
         progress_bar.close()
     
-    total_time = time.time() - start_time
+    total_time = time.monotonic() - start_time
     logger.info(
         f"Conversion complete: {successful_conversions}/{total_files} files successfully converted "
         f"in {format_time(total_time)}"
@@ -16,7 +16,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .utils import (
     check_ffmpeg, get_audio_metadata, ensure_output_directory, 
-    AudioMetadata, format_time
+    AudioMetadata, file_size, format_time, load_ffprobe_json, resolve_binary
 )
 
 # Set up logging
@@ -56,11 +56,11 @@ def extract_chapters_from_m4b(file_path: str) -> Tuple[List[ChapterInfo], AudioM
     try:
         # Get chapters
         cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            resolve_binary('ffprobe'), '-v', 'quiet', '-print_format', 'json',
             '-show_chapters', file_path
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        data = load_ffprobe_json(result.stdout)
         
         chapters = []
         for i, chapter in enumerate(data.get('chapters', [])):
@@ -195,7 +195,7 @@ def split_chapter(file_path: str, chapter: ChapterInfo, output_path: str,
         
         # Build FFmpeg command
         cmd = [
-            'ffmpeg',
+            resolve_binary('ffmpeg'), '-nostats',
             '-i', file_path,
             '-ss', str(chapter.start),
             '-t', str(chapter.duration),
@@ -238,11 +238,12 @@ def split_chapter(file_path: str, chapter: ChapterInfo, output_path: str,
         cmd.append(output_path)
         
         logger.info(f"Extracting chapter {chapter.index}: {chapter.title}")
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
         
         # Verify output file
-        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-            file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        output_size = file_size(output_path)
+        if output_size > 0:
+            file_size_mb = output_size / (1024 * 1024)
             logger.info(f"✅ Chapter {chapter.index} extracted ({file_size_mb:.1f}MB)")
             return True
         else:
@@ -250,7 +251,8 @@ def split_chapter(file_path: str, chapter: ChapterInfo, output_path: str,
             return False
             
     except subprocess.CalledProcessError as e:
-        logger.error(f"FFmpeg error extracting chapter {chapter.index}: {e.stderr}")
+        stderr = e.stderr.decode('utf-8', 'replace') if e.stderr else ''
+        logger.error(f"FFmpeg error extracting chapter {chapter.index}: {stderr}")
         return False
     except Exception as e:
         logger.error(f"Unexpected error extracting chapter {chapter.index}: {str(e)}")
@@ -5,18 +5,35 @@ This module contains common functions used across the converter and combiner mod
 """
 
 import os
+import fnmatch
+import functools
+import glob
 import subprocess
 import json
 import re
+import shutil
 import logging
 import sys
-from typing import List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AbstractSet, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
 
 if sys.version_info >= (3, 8):
     from typing import TypedDict
 else:
     from typing_extensions import TypedDict
 
+try:
+    # Optional: read MP4 atoms in-process instead of spawning ffprobe
+    from mutagen.mp4 import MP4
+except ImportError:
+    MP4 = None
+
+try:
+    # Optional: faster parsing of ffprobe's JSON output
+    import orjson
+except ImportError:
+    orjson = None
+
 # TypedDict definitions
 class AudioMetadata(TypedDict, total=False):
     """Type definition for audio metadata."""
@@ -41,83 +58,343 @@ class AudioMetadata(TypedDict, total=False):
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Splits a filename into digit and non-digit runs for natural sorting
+_NUM_RE = re.compile(r'(\d+)')
+
+# Extensions that can be read directly with mutagen's MP4 parser
+MP4_EXTENSIONS = ('.m4b', '.m4a')
+
+# Characters that make a path component a glob pattern
+_GLOB_MAGIC_RE = re.compile(r'[*?[]')
+
+# Directories listed concurrently when searching recursively for files
+MAX_SCAN_WORKERS = 8
+
+# iTunes atom names for the tags we read, keyed by their FFmpeg tag name
+MP4_TAG_ATOMS = {
+    'title': '\xa9nam',
+    'artist': '\xa9ART',
+    'album': '\xa9alb',
+    'album_artist': 'aART',
+    'composer': '\xa9wrt',
+    'genre': '\xa9gen',
+    'date': '\xa9day',
+    'comment': '\xa9cmt',
+    'description': 'desc',
+}
+
+
+def load_ffprobe_json(output: Union[bytes, str]) -> Dict:
+    """Parse ffprobe JSON output, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(output)
+    return json.loads(output)
+
 
 def format_time(seconds: float) -> str:
     """Format seconds into a human-readable time string."""
     if seconds < 60:
         return f"{seconds:.0f}s"
-    elif seconds < 3600:
-        minutes = int(seconds // 60)
-        secs = int(seconds % 60)
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
         return f"{minutes}m {secs}s"
-    else:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        return f"{hours}h {minutes}m {secs}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m {secs}s"
+
+
+# Executables found on PATH, by name. Misses aren't stored, so a binary
+# installed or added to PATH later is still found
+_resolved_binaries: Dict[str, str] = {}
+
+# Set once FFmpeg has been found; a failed check isn't remembered for the same reason
+_ffmpeg_available = False
+
+
+def resolve_binary(name: str) -> str:
+    """
+    Resolve an executable such as ffmpeg or ffprobe to its absolute path (cached).
+    
+    Commands can then launch the binary directly instead of searching PATH on
+    every call. Falls back to the bare name if it isn't found on PATH.
+    """
+    path = _resolved_binaries.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is None:
+            return name
+        _resolved_binaries[name] = path
+    return path
 
 
 def check_ffmpeg() -> bool:
-    """Check if FFmpeg is available in the system."""
-    try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-        subprocess.run(['ffprobe', '-version'], capture_output=True, check=True)
+    """Check if FFmpeg is available in the system (cached once it is found)."""
+    global _ffmpeg_available
+    if _ffmpeg_available:
         return True
+    try:
+        subprocess.run([resolve_binary('ffmpeg'), '-version'], capture_output=True, check=True)
+        subprocess.run([resolve_binary('ffprobe'), '-version'], capture_output=True, check=True)
     except (subprocess.CalledProcessError, FileNotFoundError):
         logger.error("FFmpeg/FFprobe is not installed or not found in PATH")
         return False
+    _ffmpeg_available = True
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def get_ffmpeg_encoders() -> FrozenSet[str]:
+    """Get the names of the encoders supported by the installed FFmpeg (cached)."""
+    try:
+        result = subprocess.run(
+            [resolve_binary('ffmpeg'), '-hide_banner', '-encoders'],
+            capture_output=True, text=True, check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        logger.warning("Could not list FFmpeg encoders")
+        return frozenset()
+    
+    # Encoder lines follow a " ------" separator: " A....D aac    AAC (...)"
+    encoders = set()
+    in_list = False
+    for line in result.stdout.splitlines():
+        if line.strip().startswith('---'):
+            in_list = True
+            continue
+        parts = line.split()
+        if in_list and len(parts) >= 2:
+            encoders.add(parts[1])
+    return frozenset(encoders)
+
+
+def select_aac_encoder(hwaccel: bool = False) -> str:
+    """
+    Select the AAC encoder to use for re-encoding.
+    
+    Args:
+        hwaccel: If True, prefer faster encoders when the FFmpeg build has them
+                 (libfdk_aac, or AudioToolbox on macOS)
+        
+    Returns:
+        FFmpeg encoder name
+    """
+    if hwaccel:
+        encoders = get_ffmpeg_encoders()
+        if 'libfdk_aac' in encoders:
+            return 'libfdk_aac'
+        if sys.platform == 'darwin' and 'aac_at' in encoders:
+            return 'aac_at'
+    return 'aac'
 
 
-def natural_sort_key(filename: str) -> List:
+@functools.lru_cache(maxsize=8192)
+def natural_sort_key(filename: str) -> Tuple[Union[int, str], ...]:
     """Natural sorting key for filenames with numbers."""
-    return [int(text) if text.isdigit() else text.lower() for text in re.split(r'(\d+)', filename)]
+    # Splitting on a capturing group puts the digit runs at the odd indices
+    parts: list = _NUM_RE.split(filename.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts)
+
+
+def _build_audio_metadata(tags: Dict[str, str], duration: float, stream: Dict) -> AudioMetadata:
+    """Build an AudioMetadata dict from FFmpeg-style tags and audio stream info."""
+    metadata: AudioMetadata = {
+        'duration': duration,
+        'title': tags.get('title', ''),
+        'artist': tags.get('artist', ''),
+        'album': tags.get('album', ''),
+        'album_artist': tags.get('album_artist', ''),
+        'author': tags.get('author', '') or tags.get('album_artist', ''),
+        'composer': tags.get('composer', ''),
+        'narrator': tags.get('narrator', '') or tags.get('composer', ''),
+        'genre': tags.get('genre', ''),
+        'date': tags.get('date', ''),
+        'year': tags.get('year', '') or tags.get('date', '')[:4] if tags.get('date') else '',
+        'comment': tags.get('comment', ''),
+        'description': tags.get('description', '') or tags.get('comment', ''),
+        'codec': stream.get('codec_name', ''),
+        'bitrate': stream.get('bit_rate', ''),
+        'sample_rate': stream.get('sample_rate', ''),
+        'channels': stream.get('channels', 2)
+    }
+    return metadata
+
+
+def open_mp4(file_path: str):
+    """
+    Open an MP4/M4B file with mutagen for in-process metadata reads.
+    
+    Returns:
+        mutagen MP4 object, or None if mutagen is unavailable or the file
+        cannot be parsed (callers should then fall back to ffprobe)
+    """
+    if MP4 is None or not file_path.lower().endswith(MP4_EXTENSIONS):
+        return None
+    try:
+        return MP4(file_path)
+    except Exception as e:
+        logger.debug(f"mutagen could not read {file_path}, falling back to ffprobe: {e}")
+        return None
+
+
+def _get_mp4_metadata(audio) -> AudioMetadata:
+    """Get metadata from a mutagen MP4 object in the same shape as ffprobe output."""
+    mp4_tags = audio.tags or {}
+    tags = {}
+    for name, atom in MP4_TAG_ATOMS.items():
+        values = mp4_tags.get(atom)
+        if values:
+            tags[name] = str(values[0])
+    
+    info = audio.info
+    codec = info.codec or ''
+    stream = {
+        # Normalize to FFmpeg's codec names so compatibility checks agree
+        'codec_name': 'aac' if codec.startswith('mp4a.40') else codec,
+        'bit_rate': str(info.bitrate) if info.bitrate else '',
+        'sample_rate': str(info.sample_rate) if info.sample_rate else '',
+        'channels': info.channels or 2
+    }
+    return _build_audio_metadata(tags, float(info.length), stream)
+
+
+def file_stat_key(file_path: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Build a cache key that changes whenever the file is modified.
+    
+    Returns:
+        (absolute path, mtime in ns, size), or None if the file can't be stat'ed
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+
+class _ProbeFailed(Exception):
+    """Carries a failed probe's result out of a cached probe, so it isn't cached."""
+    
+    def __init__(self, result):
+        super().__init__(result)
+        self.result = result
+
+
+def _raise_if_failed(result):
+    """Raise _ProbeFailed for an empty probe result; lru_cache only stores returns."""
+    if not result:
+        raise _ProbeFailed(result)
+    return result
 
 
 def get_audio_metadata(file_path: str) -> AudioMetadata:
     """Get audio file metadata including duration and format info."""
+    key = file_stat_key(file_path)
+    if key is None:
+        return _probe_audio_metadata(file_path)
+    try:
+        # Copy so callers can't mutate the cached entry
+        return dict(_probe_audio_metadata_cached(key))
+    except _ProbeFailed as e:
+        return e.result
+
+
+@functools.lru_cache(maxsize=4096)
+def _probe_audio_metadata_cached(key: Tuple[str, int, int]) -> AudioMetadata:
+    return _raise_if_failed(_probe_audio_metadata(key[0]))
+
+
+def _probe_audio_metadata(file_path: str) -> AudioMetadata:
+    audio = open_mp4(file_path)
+    if audio is not None:
+        return _get_mp4_metadata(audio)
+    
     try:
         cmd = [
-            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            resolve_binary('ffprobe'), '-v', 'quiet', '-print_format', 'json',
             '-show_format', '-show_streams', file_path
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        metadata = json.loads(result.stdout)
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        metadata = load_ffprobe_json(result.stdout)
         
         # Extract relevant information
         format_info = metadata.get('format', {})
         audio_stream = next((s for s in metadata.get('streams', []) if s.get('codec_type') == 'audio'), {})
         
         tags = format_info.get('tags', {})
-        metadata: AudioMetadata = {
-            'duration': float(format_info.get('duration', 0)),
-            'title': tags.get('title', ''),
-            'artist': tags.get('artist', ''),
-            'album': tags.get('album', ''),
-            'album_artist': tags.get('album_artist', ''),
-            'author': tags.get('author', '') or tags.get('album_artist', ''),
-            'composer': tags.get('composer', ''),
-            'narrator': tags.get('narrator', '') or tags.get('composer', ''),
-            'genre': tags.get('genre', ''),
-            'date': tags.get('date', ''),
-            'year': tags.get('year', '') or tags.get('date', '')[:4] if tags.get('date') else '',
-            'comment': tags.get('comment', ''),
-            'description': tags.get('description', '') or tags.get('comment', ''),
-            'codec': audio_stream.get('codec_name', ''),
-            'bitrate': audio_stream.get('bit_rate', ''),
-            'sample_rate': audio_stream.get('sample_rate', ''),
-            'channels': audio_stream.get('channels', 2)
-        }
-        return metadata
+        return _build_audio_metadata(tags, float(format_info.get('duration', 0)), audio_stream)
     except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
         logger.warning(f"Could not get metadata for {file_path}: {e}")
         return {}
 
 
+def get_audio_stream_info(file_path: str) -> AudioMetadata:
+    """
+    Get duration and audio stream parameters without reading tags.
+    
+    A trimmed ffprobe query for callers that only need the duration and the
+    codec/sample rate/channels used for compatibility checks. Tag fields are
+    left empty. Falls back to get_audio_metadata if the query fails.
+    """
+    if MP4 is not None and file_path.lower().endswith(MP4_EXTENSIONS):
+        # Reading atoms in-process is cheaper than any ffprobe call
+        return get_audio_metadata(file_path)
+    
+    key = file_stat_key(file_path)
+    if key is None:
+        return _probe_audio_stream_info(file_path)
+    try:
+        # Copy so callers can't mutate the cached entry
+        return dict(_probe_audio_stream_info_cached(key))
+    except _ProbeFailed as e:
+        return e.result
+
+
+@functools.lru_cache(maxsize=4096)
+def _probe_audio_stream_info_cached(key: Tuple[str, int, int]) -> AudioMetadata:
+    return _raise_if_failed(_probe_audio_stream_info(key[0]))
+
+
+def _probe_audio_stream_info(file_path: str) -> AudioMetadata:
+    try:
+        cmd = [
+            resolve_binary('ffprobe'), '-v', 'quiet', '-print_format', 'json',
+            '-select_streams', 'a:0', '-show_entries',
+            'format=duration:stream=codec_name,bit_rate,sample_rate,channels',
+            file_path
+        ]
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        data = load_ffprobe_json(result.stdout)
+        streams = data.get('streams') or [{}]
+        return _build_audio_metadata({}, float(data['format']['duration']), streams[0])
+    except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError, ValueError) as e:
+        logger.debug(f"Trimmed probe failed for {file_path}, using full metadata: {e}")
+        return get_audio_metadata(file_path)
+
+
 def get_audio_duration(file_path: str) -> Optional[float]:
     """Get the duration of an audio file in seconds."""
+    key = file_stat_key(file_path)
+    if key is None:
+        return _probe_audio_duration(file_path)
+    try:
+        return _probe_audio_duration_cached(key)
+    except _ProbeFailed as e:
+        return e.result
+
+
+@functools.lru_cache(maxsize=4096)
+def _probe_audio_duration_cached(key: Tuple[str, int, int]) -> Optional[float]:
+    return _raise_if_failed(_probe_audio_duration(key[0]))
+
+
+def _probe_audio_duration(file_path: str) -> Optional[float]:
+    audio = open_mp4(file_path)
+    if audio is not None:
+        return float(audio.info.length)
+    
     try:
         cmd = [
-            'ffprobe', '-v', 'quiet', '-show_entries', 
+            resolve_binary('ffprobe'), '-v', 'quiet', '-show_entries', 
             'format=duration', '-of', 'csv=p=0', file_path
         ]
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
@@ -127,6 +404,171 @@ def get_audio_duration(file_path: str) -> Optional[float]:
         return None
 
 
+def _split_glob_pattern(pattern: str) -> Tuple[str, List[str]]:
+    """Split a glob pattern into its literal leading directory and the remaining components."""
+    parts = pattern.replace(os.sep, '/').split('/')
+    for index, part in enumerate(parts):
+        if _GLOB_MAGIC_RE.search(part):
+            root = '/'.join(parts[:index])
+            if not root and pattern.startswith('/'):
+                root = '/'
+            return root, parts[index:]
+    return pattern, []
+
+
+def iter_matching_files(pattern: str, extensions: AbstractSet[str]) -> Iterator[str]:
+    """
+    Yield files matching a glob pattern that have one of the given extensions.
+    
+    Patterns of the form "dir/*.ext" and "dir/**/*.ext" are matched during a
+    scandir walk that checks the extension on each directory entry before
+    anything else, so unrelated files cost neither a stat nor a list slot.
+    Recursive walks list several directories concurrently. Other
+    patterns fall back to glob. Results follow glob's conventions: hidden
+    entries are skipped and paths keep the pattern's leading directory.
+    
+    Args:
+        pattern: Glob pattern, optionally using "**" for recursion
+        extensions: Lowercase file extensions to keep, including the dot
+        
+    Yields:
+        Paths of matching files
+    """
+    root, rest = _split_glob_pattern(pattern)
+    recursive = len(rest) == 2 and rest[0] == '**'
+    if not (len(rest) == 1 or recursive) or '**' in rest[-1]:
+        for path in glob.iglob(pattern, recursive=True):
+            if os.path.splitext(path)[1].lower() in extensions:
+                yield path
+        return
+    
+    name_pattern = rest[-1]
+    start = (root or os.curdir, root)
+    if not recursive:
+        yield from _scan_directory(start[0], start[1], name_pattern, False, extensions)[0]
+        return
+    
+    # Scan several directories at once so the getdents/stat latency of one
+    # directory overlaps with others, which matters most on cold or network storage
+    with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS) as executor:
+        pending = {executor.submit(_scan_directory, start[0], start[1], name_pattern, True, extensions)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                matches, subdirectories = future.result()
+                yield from matches
+                for directory, prefix in subdirectories:
+                    pending.add(executor.submit(_scan_directory, directory, prefix, name_pattern, True, extensions))
+
+
+def _scan_directory(directory: str, prefix: str, name_pattern: str, recursive: bool,
+                    extensions: AbstractSet[str]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """
+    List one directory for iter_matching_files.
+    
+    Returns:
+        Tuple of (matching file paths, (directory, prefix) pairs to descend into)
+    """
+    include_hidden = name_pattern.startswith('.')
+    matches = []
+    subdirectories = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.') and not include_hidden:
+                    continue
+                if (os.path.splitext(name)[1].lower() in extensions
+                        and fnmatch.fnmatch(name, name_pattern) and entry.is_file()):
+                    matches.append(os.path.join(prefix, name))
+                elif recursive and not name.startswith('.') and entry.is_dir():
+                    subdirectories.append((entry.path, os.path.join(prefix, name)))
+    except OSError as e:
+        logger.debug(f"Could not read directory {directory}: {e}")
+    return matches, subdirectories
+
+
+def file_size(file_path: str) -> int:
+    """Size of a file in bytes from a single stat, or 0 if it can't be read."""
+    try:
+        return os.stat(file_path).st_size
+    except OSError:
+        return 0
+
+
 def ensure_output_directory(file_path: str) -> None:
     """Ensure the output directory exists for the given file path."""
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
\ No newline at end of file
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+
+def drop_page_cache(file_path: str) -> None:
+    """
+    Ask the kernel to evict a file we won't read again from the page cache.
+    
+    Large outputs would otherwise push other programs' hot data out of memory.
+    No-op on platforms without posix_fadvise; failures are ignored.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        # Dirty pages can't be dropped until they're written back
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _available_memory() -> Optional[int]:
+    """Bytes of free physical memory, or None if the platform can't tell."""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def prefetch_files(file_paths: Sequence[str]) -> bool:
+    """
+    Ask the kernel to start reading files into the page cache in the background.
+    
+    Inputs that FFmpeg reads one after another are then mostly in memory by the
+    time it opens them, with readahead done in large sequential requests. Skipped
+    when the files wouldn't fit in free memory, since they'd only evict each
+    other. No-op on platforms without posix_fadvise; failures are ignored.
+    
+    Returns:
+        True if prefetching was requested, False if it was skipped
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    
+    total_size = 0
+    for file_path in file_paths:
+        try:
+            total_size += os.stat(file_path).st_size
+        except OSError:
+            pass
+    available = _available_memory()
+    if available is None or total_size > available:
+        return False
+    
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            # WILLNEED queues asynchronous reads and returns immediately
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return True
@@ -5,6 +5,19 @@ Pytest configuration and shared fixtures.
 import pytest
 import tempfile
 import os
+import shutil
+
+
+@pytest.fixture(scope="session")
+def ffmpeg_available():
+    """Whether FFmpeg and FFprobe are on PATH, checked once per session without running them."""
+    return bool(shutil.which('ffmpeg') and shutil.which('ffprobe'))
+
+
+@pytest.fixture(scope="session")
+def audio_cache_dir(tmp_path_factory):
+    """Directory for generated audio shared by every test in the session."""
+    return str(tmp_path_factory.mktemp("audio_cache"))
 
 
 @pytest.fixture
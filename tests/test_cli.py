@@ -12,6 +12,12 @@ import subprocess
 from m4b_tools.cli import main, create_parser
 
 
+@pytest.fixture(scope="class")
+def parser():
+    """Build the argument parser once per class; parse_args keeps no state between calls."""
+    return create_parser()
+
+
 class TestCLI:
     """Test the command-line interface."""
     
@@ -28,10 +34,8 @@ class TestCLI:
         assert "generate-csv" in help_text
         assert "split" in help_text
     
-    def test_convert_parser(self):
+    def test_convert_parser(self, parser):
         """Test the convert subcommand parser."""
-        parser = create_parser()
-        
         # Test valid convert arguments
         args = parser.parse_args(['convert', 'pattern', 'output_dir'])
         assert args.command == 'convert'
@@ -40,11 +44,10 @@ class TestCLI:
         assert args.jobs == 1
         assert not args.flat
         assert not args.progress_bar
+        assert not args.dry_run
     
-    def test_combine_parser(self):
+    def test_combine_parser(self, parser):
         """Test the combine subcommand parser."""
-        parser = create_parser()
-        
         # Test valid combine arguments
         args = parser.parse_args(['combine', 'pattern', 'output.m4b'])
         assert args.command == 'combine'
@@ -52,11 +55,17 @@ class TestCLI:
         assert args.output == 'output.m4b'
         assert not args.preserve_chapters
         assert args.csv is None
+        assert not args.hwaccel
+        assert not args.dry_run
+        assert not args.stream_encoded
+        
+        # --csv takes one file per flag, leaving positionals to the pattern
+        args = parser.parse_args(['combine', '--csv', 'book.csv', 'extra.m4b'])
+        assert args.csv == ['book.csv']
+        assert args.pattern == 'extra.m4b'
     
-    def test_generate_csv_parser(self):
+    def test_generate_csv_parser(self, parser):
         """Test the generate-csv subcommand parser."""
-        parser = create_parser()
-        
         # Test valid generate-csv arguments
         args = parser.parse_args(['generate-csv', 'folder'])
         assert args.command == 'generate-csv'
@@ -70,7 +79,7 @@ class TestCLI:
                 result = main()
                 assert result == 1
     
-    @patch('m4b_tools.cli.convert_all_to_m4b')
+    @patch('m4b_tools.converter.convert_all_to_m4b')
     def test_convert_command_success(self, mock_convert):
         """Test successful convert command."""
         mock_convert.return_value = (5, 5)  # All files converted successfully
@@ -81,7 +90,7 @@ class TestCLI:
                 assert result == 0
                 mock_convert.assert_called_once()
     
-    @patch('m4b_tools.cli.convert_all_to_m4b')
+    @patch('m4b_tools.converter.convert_all_to_m4b')
     def test_convert_command_partial_failure(self, mock_convert):
         """Test convert command with partial failures."""
         mock_convert.return_value = (3, 5)  # Some files failed
@@ -92,7 +101,7 @@ class TestCLI:
                 assert result == 0  # Partial success still returns 0
                 mock_convert.assert_called_once()
     
-    @patch('m4b_tools.cli.combine_m4b_files')
+    @patch('m4b_tools.combiner.combine_m4b_files')
     def test_combine_command_success(self, mock_combine):
         """Test successful combine command."""
         mock_combine.return_value = True
@@ -103,7 +112,7 @@ class TestCLI:
                 assert result == 0
                 mock_combine.assert_called_once()
     
-    @patch('m4b_tools.cli.combine_m4b_files')
+    @patch('m4b_tools.combiner.combine_m4b_files')
     def test_combine_command_failure(self, mock_combine):
         """Test failed combine command."""
         mock_combine.return_value = False
@@ -114,7 +123,31 @@ class TestCLI:
                 assert result == 1
                 mock_combine.assert_called_once()
     
-    @patch('m4b_tools.cli.generate_csv_from_folder')
+    @patch('m4b_tools.combiner.combine_many')
+    def test_combine_command_many_csv(self, mock_combine_many):
+        """Test that several CSV files are combined in parallel."""
+        mock_combine_many.return_value = {'a.csv': True, 'b.csv': True}
+        
+        with patch('sys.argv', ['m4b-tools', 'combine', '--csv', 'a.csv', '--csv', 'b.csv', '-j', '2']):
+            with patch('builtins.print') as mock_print:
+                result = main()
+                assert result == 0
+                mock_combine_many.assert_called_once()
+                assert mock_combine_many.call_args[0][0] == ['a.csv', 'b.csv']
+                assert mock_combine_many.call_args[1]['max_workers'] == 2
+    
+    @patch('m4b_tools.combiner.combine_many')
+    def test_combine_command_many_csv_dry_run(self, mock_combine_many, capsys):
+        """Test that each book's dry-run metadata is printed whole under its own header."""
+        mock_combine_many.return_value = {'a.csv': ";FFMETADATA1\ntitle=A\n", 'b.csv': ";FFMETADATA1\ntitle=B\n"}
+        
+        with patch('sys.argv', ['m4b-tools', 'combine', '--csv', 'a.csv', '--csv', 'b.csv', '--dry-run']):
+            assert main() == 0
+        
+        output = capsys.readouterr().out
+        assert "==> a.csv <==\n;FFMETADATA1\ntitle=A\n==> b.csv <==\n;FFMETADATA1\ntitle=B\n" in output
+    
+    @patch('m4b_tools.combiner.generate_csv_from_folder')
     def test_generate_csv_command_success(self, mock_generate):
         """Test successful generate-csv command."""
         mock_generate.return_value = True
@@ -127,7 +160,7 @@ class TestCLI:
     
     def test_keyboard_interrupt(self):
         """Test handling of keyboard interrupt."""
-        with patch('m4b_tools.cli.convert_all_to_m4b') as mock_convert:
+        with patch('m4b_tools.converter.convert_all_to_m4b') as mock_convert:
             mock_convert.side_effect = KeyboardInterrupt()
             
             with patch('sys.argv', ['m4b-tools', 'convert', '*.mp3', 'output']):
@@ -135,10 +168,8 @@ class TestCLI:
                     result = main()
                     assert result == 130
     
-    def test_split_parser(self):
+    def test_split_parser(self, parser):
         """Test the split subcommand parser."""
-        parser = create_parser()
-        
         # Test valid split arguments
         args = parser.parse_args(['split', 'test.m4b', './output'])
         assert args.command == 'split'
@@ -163,10 +194,8 @@ class TestCLI:
         assert '--template' in result.stdout
         assert '--jobs' in result.stdout
     
-    def test_split_command_arguments(self):
+    def test_split_command_arguments(self, parser):
         """Test split command argument parsing."""
-        parser = create_parser()
-        
         # Test basic arguments
         args = parser.parse_args(['split', 'test.m4b', './output'])
         assert args.command == 'split'
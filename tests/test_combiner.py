@@ -0,0 +1,285 @@
+"""
+Unit tests for the M4B combiner module.
+"""
+
+import io
+import os
+import urllib.error
+import pytest
+from email.message import Message
+from unittest.mock import patch
+
+from m4b_tools.combiner import (
+    _extract_title_or_derive, adts_stream_duration, combine_m4b_files, combine_many, create_chapter_metadata,
+    create_concat_file, derive_chapter_title, download_cover_art, extract_files_chapters, format_concat_list, iter_m4b_files, parse_csv_input,
+    generate_csv_from_multiple_folders, probe_files_metadata
+)
+
+
+class TestCombinerModule:
+    """Test the combiner module functions."""
+    
+    @patch('m4b_tools.combiner.get_audio_metadata')
+    def test_probe_files_metadata_preserves_order(self, mock_metadata):
+        """Test that concurrent probing returns results in input order."""
+        mock_metadata.side_effect = lambda path: {'title': path}
+        
+        files = [f"file{i}.m4b" for i in range(20)]
+        results = probe_files_metadata(files)
+        
+        assert [meta['title'] for meta in results] == files
+        assert mock_metadata.call_count == len(files)
+    
+    def test_probe_files_metadata_empty(self):
+        """Test probing an empty file list."""
+        assert probe_files_metadata([]) == []
+    
+    @patch('m4b_tools.combiner.extract_existing_chapters')
+    def test_extract_files_chapters_preserves_order(self, mock_chapters):
+        """Test that concurrent chapter extraction returns results in input order."""
+        mock_chapters.side_effect = lambda path: [{'title': path}]
+        
+        files = [f"file{i}.m4b" for i in range(20)]
+        assert extract_files_chapters(files) == [[{'title': path}] for path in files]
+        assert extract_files_chapters([]) == []
+    
+    def test_iter_m4b_files(self, temp_dir):
+        """Test recursive discovery of M4B files filtered by extension."""
+        os.makedirs(os.path.join(temp_dir, "sub"))
+        os.makedirs(os.path.join(temp_dir, ".hidden"))
+        for name in ["a.m4b", "b.M4A", "c.mp3", os.path.join("sub", "d.m4b"),
+                     os.path.join(".hidden", "e.m4b")]:
+            open(os.path.join(temp_dir, name), 'w').close()
+        
+        found = sorted(os.path.relpath(p, temp_dir) for p in iter_m4b_files(temp_dir))
+        assert found == sorted(["a.m4b", "b.M4A", os.path.join("sub", "d.m4b")])
+    
+    @patch('m4b_tools.combiner.get_audio_metadata')
+    def test_generate_csv_from_multiple_folders_probes_once(self, mock_metadata, temp_dir):
+        """Test that each file is probed once and its metadata lands in its own folder's CSV."""
+        mock_metadata.side_effect = lambda path: {'title': os.path.relpath(path, temp_dir)}
+        for book in ["book1", "book2"]:
+            os.makedirs(os.path.join(temp_dir, book))
+            for name in ["10.m4b", "02.m4b"]:
+                open(os.path.join(temp_dir, book, name), 'w').close()
+        
+        assert generate_csv_from_multiple_folders(os.path.join(temp_dir, "book*"))
+        
+        assert mock_metadata.call_count == 4
+        for book in ["book1", "book2"]:
+            with open(os.path.join(temp_dir, book, f"{book}.csv")) as f:
+                rows = [line.rstrip("\n") for line in f if line.startswith(("02.m4b", "10.m4b"))]
+            assert rows == [f"{name},{os.path.join(book, name)}" for name in ["02.m4b", "10.m4b"]]
+    
+    def test_parse_csv_input(self, temp_dir):
+        """Test parsing metadata headers and file rows from a CSV file."""
+        for name in ["one.m4b", "two.m4b"]:
+            open(os.path.join(temp_dir, name), 'w').close()
+        
+        csv_file = os.path.join(temp_dir, "book.csv")
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write("#title,Test Book\n")
+            f.write("#author: Test Author\n")
+            f.write("\n")
+            f.write("file,title\n")
+            f.write("one.m4b,Chapter One\n")
+            f.write("\n")
+            f.write("two.m4b,Chapter Two\n")
+            f.write("missing.m4b,Missing\n")
+        
+        file_list, metadata = parse_csv_input(csv_file)
+        
+        assert metadata == {'title': 'Test Book', 'author': 'Test Author'}
+        assert [entry['title'] for entry in file_list] == ["Chapter One", "Chapter Two"]
+        assert file_list[0]['file'] == os.path.join(temp_dir, "one.m4b")
+    
+    def test_parse_csv_input_without_data_rows(self, temp_dir):
+        """Test that a CSV with only metadata headers is rejected."""
+        csv_file = os.path.join(temp_dir, "book.csv")
+        with open(csv_file, 'w', encoding='utf-8') as f:
+            f.write("#title,Test Book\n\n")
+        
+        with pytest.raises(ValueError):
+            parse_csv_input(csv_file)
+    
+    def test_create_concat_file_escapes_quotes(self, temp_dir):
+        """Test that single quotes in paths are escaped for FFmpeg."""
+        concat_path = create_concat_file(["/books/plain.m4b", "/books/it's.m4b"], temp_dir)
+        
+        with open(concat_path, encoding='utf-8') as f:
+            assert f.read() == "file '/books/plain.m4b'\nfile '/books/it'\\''s.m4b'\n"
+    
+    def test_format_concat_list_as_urls(self):
+        """Test that piped concat lists use absolute file: URLs."""
+        concat_list = format_concat_list(["plain.m4b"], as_urls=True)
+        assert concat_list == f"file 'file:{os.path.abspath('plain.m4b')}'\n"
+    
+    @pytest.mark.parametrize("url,content_type,expected", [
+        ("https://example.com/cover.png", "image/jpeg", "cover.png"),
+        ("https://example.com/cover", "image/webp", "cover.webp"),
+        ("https://example.com/cover?size=large", "application/octet-stream", "cover.jpg"),
+    ])
+    @patch('m4b_tools.combiner.urllib.request.urlopen')
+    def test_download_cover_art(self, mock_urlopen, url, content_type, expected, temp_dir):
+        """Test that the cover extension comes from the URL, then the served type."""
+        response = io.BytesIO(b"image data")
+        response.headers = Message()
+        response.headers['Content-Type'] = content_type
+        mock_urlopen.return_value = response
+        
+        with patch('m4b_tools.combiner._cover_cache_dir', return_value=os.path.join(temp_dir, "cache")):
+            cover_path = download_cover_art(url, temp_dir)
+        
+        assert cover_path == os.path.join(temp_dir, expected)
+        with open(cover_path, 'rb') as f:
+            assert f.read() == b"image data"
+        assert mock_urlopen.call_args[1]['timeout'] > 0
+    
+    @patch('m4b_tools.combiner.urllib.request.urlopen')
+    def test_download_cover_art_uses_cache(self, mock_urlopen, temp_dir):
+        """Test that an unchanged or unreachable cover is copied from the cache."""
+        url = "https://example.com/cover.png"
+        response = io.BytesIO(b"image data")
+        response.headers = Message()
+        response.headers['Last-Modified'] = "Tue, 01 Sep 2026 10:00:00 GMT"
+        mock_urlopen.return_value = response
+        cache_dir = os.path.join(temp_dir, "cache")
+        book_dirs = [os.path.join(temp_dir, f"book{i}") for i in range(3)]
+        for book_dir in book_dirs:
+            os.makedirs(book_dir)
+        
+        with patch('m4b_tools.combiner._cover_cache_dir', return_value=cache_dir):
+            download_cover_art(url, book_dirs[0])
+            
+            mock_urlopen.side_effect = urllib.error.HTTPError(url, 304, "Not Modified", Message(), None)
+            unchanged_path = download_cover_art(url, book_dirs[1])
+            request = mock_urlopen.call_args[0][0]
+            assert request.get_header('If-modified-since') == "Tue, 01 Sep 2026 10:00:00 GMT"
+            
+            mock_urlopen.side_effect = urllib.error.URLError("offline")
+            offline_path = download_cover_art(url, book_dirs[2])
+        
+        # Each book gets its own copy; the cache holds just the one image
+        assert unchanged_path == os.path.join(book_dirs[1], "cover.png")
+        assert offline_path == os.path.join(book_dirs[2], "cover.png")
+        for path in (unchanged_path, offline_path):
+            with open(path, 'rb') as f:
+                assert f.read() == b"image data"
+        assert [files for _, _, files in os.walk(cache_dir) if files] == [["cover.png"]]
+    
+    def test_titles_from_filenames(self):
+        """Test chapter and CSV template titles cleaned up from filenames."""
+        assert derive_chapter_title("/book/Chapter 03 - the_end.m4b", 3) == "The End"
+        assert derive_chapter_title("/book/01.m4b", 7) == "Chapter 7"
+        assert derive_chapter_title("/book/01.m4b", 7, " Tagged ") == "Tagged"
+        assert _extract_title_or_derive("/book/ch-2_intro.m4b", {}) == "Intro"
+        assert _extract_title_or_derive("/book/007.m4b", {}) == "007"
+        assert _extract_title_or_derive("/book/007.m4b", {'title': "Tagged"}) == "Tagged"
+    
+    def test_create_chapter_metadata(self, temp_dir):
+        """Test the FFMETADATA1 document written for chapters and book metadata."""
+        chapters = [
+            {'title': 'One', 'start': 0.0, 'end': 1.5},
+            {'title': 'Two', 'start': 1.5, 'end': 3.0},
+        ]
+        metadata_path = create_chapter_metadata(
+            chapters, temp_dir, {'title': 'Book', 'author': 'Someone', 'year': ''}
+        )
+        
+        with open(metadata_path, encoding='utf-8') as f:
+            content = f.read()
+        
+        assert content == (
+            ";FFMETADATA1\n"
+            "title=Book\n"
+            "album_artist=Someone\n"
+            "\n"
+            "[CHAPTER]\nTIMEBASE=1/1000\nSTART=0\nEND=1500\ntitle=One\n\n"
+            "[CHAPTER]\nTIMEBASE=1/1000\nSTART=1500\nEND=3000\ntitle=Two\n\n"
+        )
+    
+    def test_adts_stream_duration(self):
+        """Test predicting the padded length of a streamed AAC encode."""
+        # 44100 samples round up to 44 frames, plus one frame of priming
+        assert adts_stream_duration(1.0, 44100) == 45 * 1024 / 44100
+        assert adts_stream_duration(0.0, 44100) == 1024 / 44100
+        # Encoders with a longer delay push the stream into further frames
+        assert adts_stream_duration(1.0, 44100, priming=2112) == 46 * 1024 / 44100
+    
+    @patch('m4b_tools.combiner.subprocess.run')
+    @patch('m4b_tools.combiner.probe_files_metadata')
+    @patch('m4b_tools.combiner.check_ffmpeg', return_value=True)
+    def test_combine_dry_run(self, mock_check, mock_probe, mock_run, temp_dir, capsys):
+        """Test that a dry run returns the chapter metadata without running FFmpeg."""
+        for name in ("01.m4b", "02.m4b"):
+            open(os.path.join(temp_dir, name), 'w').close()
+        mock_probe.return_value = [
+            {'duration': 1.5, 'codec': 'aac', 'sample_rate': '44100', 'channels': 2, 'title': 'One'},
+            {'duration': 2.0, 'codec': 'aac', 'sample_rate': '44100', 'channels': 2, 'title': 'Two'},
+        ]
+        output_file = os.path.join(temp_dir, "out.m4b")
+        
+        output = combine_m4b_files(os.path.join(temp_dir, "*.m4b"), output_file, dry_run=True)
+        
+        assert capsys.readouterr().out == ""
+        assert output.startswith(";FFMETADATA1\n")
+        assert "START=1500\nEND=3500\ntitle=Two\n" in output
+        mock_run.assert_not_called()
+        assert not os.path.exists(output_file)
+    
+    @patch('m4b_tools.combiner.reencode_files_for_concat', return_value=None)
+    @patch('m4b_tools.combiner.probe_files_metadata')
+    @patch('m4b_tools.combiner.check_ffmpeg', return_value=True)
+    def test_combine_failure_leaves_no_output_dir(self, mock_check, mock_probe, mock_reencode, temp_dir):
+        """Test that a failed combine doesn't create the output's directory."""
+        for name in ("01.m4b", "02.m4b"):
+            open(os.path.join(temp_dir, name), 'w').close()
+        mock_probe.return_value = [
+            {'duration': 1.5, 'codec': 'aac', 'sample_rate': '22050', 'channels': 2},
+            {'duration': 2.0, 'codec': 'aac', 'sample_rate': '44100', 'channels': 2},
+        ]
+        output_dir = os.path.join(temp_dir, "books")
+        
+        assert not combine_m4b_files(os.path.join(temp_dir, "*.m4b"), os.path.join(output_dir, "out.m4b"))
+        
+        mock_reencode.assert_called_once()
+        assert not os.path.exists(output_dir)
+    
+    @patch('m4b_tools.combiner.reencode_files_for_concat')
+    @patch('m4b_tools.combiner.probe_files_metadata')
+    @patch('m4b_tools.combiner.check_ffmpeg', return_value=True)
+    def test_combine_stages_reencodes_beside_output(self, mock_check, mock_probe, mock_reencode, temp_dir):
+        """Test that staged re-encodes go under the output's nearest existing directory."""
+        for name in ("01.m4b", "02.m4b"):
+            open(os.path.join(temp_dir, name), 'w').close()
+        mock_probe.return_value = [
+            {'duration': 1.5, 'codec': 'aac', 'sample_rate': '22050', 'channels': 2},
+            {'duration': 2.0, 'codec': 'aac', 'sample_rate': '44100', 'channels': 2},
+        ]
+        staged_dirs = []
+        
+        def reencode(files, output_dir, *args):
+            staged_dirs.append(os.path.dirname(output_dir))
+            assert os.stat(staged_dirs[0]).st_dev == os.stat(temp_dir).st_dev
+        mock_reencode.side_effect = reencode
+        
+        assert not combine_m4b_files(os.path.join(temp_dir, "*.m4b"),
+                                     os.path.join(temp_dir, "books", "out.m4b"))
+        
+        assert len(staged_dirs) == 1
+        assert os.path.dirname(staged_dirs[0]) == os.path.abspath(temp_dir)
+        assert os.path.basename(staged_dirs[0]).startswith('.m4b_tmp_')
+        assert not os.path.exists(staged_dirs[0])
+    
+    @patch('m4b_tools.combiner.combine_m4b_files')
+    def test_combine_many(self, mock_combine):
+        """Test that each CSV is combined once and its result reported."""
+        mock_combine.side_effect = lambda csv_file, **kwargs: csv_file != "b.csv"
+        
+        results = combine_many(["a.csv", "b.csv", "c.csv"], max_workers=2, hwaccel=True)
+        
+        assert results == {"a.csv": True, "b.csv": False, "c.csv": True}
+        assert mock_combine.call_count == 3
+        assert all(call[1]['hwaccel'] for call in mock_combine.call_args_list)
+        # The CPUs are split between the books running at once
+        assert mock_combine.call_args[1]['cpu_count'] == max(1, (os.cpu_count() or 1) // 2)
@@ -0,0 +1,166 @@
+"""
+Unit tests for the M4B converter module.
+"""
+
+import os
+import glob
+import logging
+import pytest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from m4b_tools.converter import (
+    SUPPORTED_FORMATS, _make_output_path_resolver, convert_all_to_m4b, convert_batch_to_m4b,
+    convert_to_m4b, iter_audio_files
+)
+
+
+class TestConverterModule:
+    """Test the converter module functions."""
+    
+    @staticmethod
+    def make_audio_tree(root):
+        """Create empty audio and non-audio files, some hidden or nested."""
+        os.makedirs(os.path.join(root, "sub", ".hidden"))
+        for name in ["a.mp3", "B.FLAC", "notes.txt", ".skip.mp3",
+                     os.path.join("sub", "c.wav"), os.path.join("sub", ".hidden", "d.mp3")]:
+            open(os.path.join(root, name), 'w').close()
+    
+    @pytest.mark.parametrize("pattern", ["*", "*.mp3", os.path.join("**", "*"), os.path.join("s*", "*")])
+    def test_iter_audio_files_matches_glob(self, pattern, temp_dir):
+        """Test that the scandir walk finds the same files as glob."""
+        self.make_audio_tree(temp_dir)
+        
+        full_pattern = os.path.join(temp_dir, pattern)
+        expected = sorted(
+            path for path in glob.glob(full_pattern, recursive=True)
+            if os.path.splitext(path)[1].lower() in SUPPORTED_FORMATS
+        )
+        assert sorted(iter_audio_files(full_pattern)) == expected
+    
+    def test_iter_audio_files_skips_hidden(self, temp_dir):
+        """Test that a recursive walk skips hidden files and directories."""
+        self.make_audio_tree(temp_dir)
+        
+        recursive = sorted(iter_audio_files(os.path.join(temp_dir, "**", "*")))
+        assert recursive == [
+            os.path.join(temp_dir, "B.FLAC"),
+            os.path.join(temp_dir, "a.mp3"),
+            os.path.join(temp_dir, "sub", "c.wav"),
+        ]
+    
+    @patch('m4b_tools.converter.av', SimpleNamespace(container=SimpleNamespace(InputContainer=object)))
+    @patch('m4b_tools.converter._convert_with_pyav')
+    @patch('m4b_tools.converter.subprocess.run')
+    def test_convert_skips_pyav_without_chapters(self, mock_run, mock_pyav, temp_dir):
+        """Test that a PyAV too old to copy chapters leaves conversion to the ffmpeg CLI."""
+        convert_to_m4b(os.path.join(temp_dir, "input.mp3"), os.path.join(temp_dir, "output.m4b"))
+        
+        mock_pyav.assert_not_called()
+        mock_run.assert_called_once()
+    
+    @pytest.mark.parametrize("codec,copied", [("aac", True), ("mp3", False)])
+    @patch('m4b_tools.converter.av', None)
+    @patch('m4b_tools.converter.subprocess.run')
+    @patch('m4b_tools.converter.get_audio_stream_info')
+    def test_convert_remuxes_aac_sources(self, mock_info, mock_run, codec, copied, temp_dir):
+        """Test that AAC audio is copied instead of re-encoded."""
+        mock_info.return_value = {'codec': codec}
+        
+        convert_to_m4b(os.path.join(temp_dir, "input.m4a"), os.path.join(temp_dir, "output.m4b"))
+        
+        cmd = mock_run.call_args[0][0]
+        assert ('copy' in cmd) == copied
+        assert ('64k' in cmd) != copied
+    
+    @pytest.mark.parametrize("returncode", [0, 1])
+    @patch('m4b_tools.converter.av', None)
+    @patch('m4b_tools.converter.convert_to_m4b', return_value=True)
+    @patch('m4b_tools.converter.subprocess.run')
+    def test_convert_batch(self, mock_run, mock_convert, returncode, temp_dir):
+        """Test that a batch runs one FFmpeg process and retries every file on failure."""
+        jobs = [(os.path.join(temp_dir, name), os.path.join(temp_dir, "out", name + ".m4b"))
+                for name in ["a.mp3", "b.flac", "c.m4a"]]
+        mock_run.return_value.returncode = returncode
+        mock_run.return_value.stderr = b"error"
+        # A failed batch leaves only the first output behind
+        for _, output_file in jobs[:2 if returncode == 0 else 1]:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            with open(output_file, 'wb') as f:
+                f.write(b"data")
+        
+        assert convert_batch_to_m4b(jobs) == [True, True, True]
+        
+        cmd = mock_run.call_args[0][0]
+        assert cmd.count('-i') == 2
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == '-map_metadata'] == ['0', '1']
+        converted_alone = [call[0][0] for call in mock_convert.call_args_list]
+        if returncode == 0:
+            assert converted_alone == [jobs[2][0]]
+        else:
+            # Outputs left by the failed batch are discarded before the retries
+            assert converted_alone == [job[0] for job in jobs]
+            assert not os.path.exists(jobs[0][1])
+    
+    @pytest.mark.skipif(not hasattr(os, "symlink") or os.name == "nt", reason="needs symlinks")
+    @patch('m4b_tools.converter.check_ffmpeg', return_value=True)
+    def test_convert_all_dry_run_symlinks_and_duplicates(self, mock_check, temp_dir, caplog):
+        """Test that outputs behind a symlink count as existing and duplicate outputs are warned about."""
+        source_dir = os.path.join(temp_dir, "in")
+        os.makedirs(os.path.join(source_dir, "book"))
+        for name in [os.path.join("book", "a.mp3"), os.path.join("book", "b.mp3"), os.path.join("book", "b.flac")]:
+            open(os.path.join(source_dir, name), 'w').close()
+        real_dir = os.path.join(temp_dir, "real")
+        os.makedirs(real_dir)
+        open(os.path.join(real_dir, "a.m4b"), 'w').close()
+        output_dir = os.path.join(temp_dir, "out")
+        os.makedirs(output_dir)
+        os.symlink(real_dir, os.path.join(output_dir, "book"))
+        
+        with caplog.at_level(logging.INFO, logger='m4b_tools.converter'):
+            planned, total = convert_all_to_m4b(os.path.join(source_dir, "**", "*"), output_dir,
+                                                base_input_path=source_dir, dry_run=True)
+        
+        assert (planned, total) == (1, 3)
+        assert "a.mp3 - output already exists" in caplog.text
+        assert any(record.levelno == logging.WARNING and "already converts to" in record.getMessage()
+                   for record in caplog.records)
+    
+    def test_output_path_resolver(self):
+        """Test output paths for flat, base-relative and pattern-relative layouts."""
+        out = Path("out")
+        
+        flat = _make_output_path_resolver(out, False, None, "books/**/*.mp3")
+        assert flat("books/a/ch1.mp3") == out / "ch1.m4b"
+        
+        relative = _make_output_path_resolver(out, True, Path("/library"), "**/*.mp3")
+        assert relative("/library/a/ch1.mp3") == out / "a" / "ch1.m4b"
+        assert relative("/elsewhere/ch2.mp3") == out / "ch2.m4b"
+        
+        pattern = _make_output_path_resolver(out, True, None, "books/**/*.flac")
+        assert pattern("books/a/b/ch3.flac") == out / "a" / "b" / "ch3.m4b"
+        assert pattern("books//a/ch5.flac") == out / "a" / "ch5.m4b"
+        assert pattern("./books/a/ch6.flac") == out / "a" / "ch6.m4b"
+        
+        simple = _make_output_path_resolver(out, True, None, "books/*.mp3")
+        assert simple("books/ch4.mp3") == out / "ch4.m4b"
+    
+    @patch('m4b_tools.converter.check_ffmpeg', return_value=True)
+    @patch('m4b_tools.converter.convert_to_m4b')
+    def test_convert_all_dry_run(self, mock_convert, mock_check, temp_dir, caplog):
+        """Test that a dry run logs the plan and skips existing outputs."""
+        output_dir = os.path.join(temp_dir, "out")
+        os.makedirs(output_dir)
+        for name in ["a.mp3", "b.mp3"]:
+            open(os.path.join(temp_dir, name), 'w').close()
+        open(os.path.join(output_dir, "b.m4b"), 'w').close()
+        
+        with caplog.at_level(logging.INFO, logger='m4b_tools.converter'):
+            planned, total = convert_all_to_m4b(os.path.join(temp_dir, "*.mp3"), output_dir,
+                                                preserve_structure=False, dry_run=True)
+        
+        assert (planned, total) == (1, 2)
+        assert f"-> {os.path.join(output_dir, 'a.m4b')}" in caplog.text
+        assert "b.mp3 - output already exists" in caplog.text
+        mock_convert.assert_not_called()
@@ -11,7 +11,9 @@ from pathlib import Path
 
 from m4b_tools.utils import (
     format_time, check_ffmpeg, natural_sort_key, 
-    get_audio_metadata, get_audio_duration, ensure_output_directory
+    get_audio_metadata, get_audio_duration, ensure_output_directory,
+    get_ffmpeg_encoders, select_aac_encoder, get_audio_stream_info, load_ffprobe_json,
+    drop_page_cache, iter_matching_files, prefetch_files, resolve_binary
 )
 
 
@@ -26,18 +28,57 @@ class TestUtils:
         assert format_time(3600) == "1h 0m 0s"
         assert format_time(0) == "0s"
     
+    @patch('m4b_tools.utils._ffmpeg_available', False)
     @patch('subprocess.run')
     def test_check_ffmpeg_success(self, mock_run):
         """Test FFmpeg check when FFmpeg is available."""
         mock_run.return_value = MagicMock()
         assert check_ffmpeg() is True
-        assert mock_run.call_count == 2  # Called for both ffmpeg and ffprobe
+        assert check_ffmpeg() is True
+        assert mock_run.call_count == 2  # Called once for both ffmpeg and ffprobe
     
+    @patch('m4b_tools.utils._ffmpeg_available', False)
     @patch('subprocess.run')
     def test_check_ffmpeg_failure(self, mock_run):
-        """Test FFmpeg check when FFmpeg is not available."""
+        """Test FFmpeg check when FFmpeg is not available, and that the miss isn't cached."""
         mock_run.side_effect = FileNotFoundError()
         assert check_ffmpeg() is False
+        
+        # Once FFmpeg turns up, the next check finds it
+        mock_run.side_effect = None
+        assert check_ffmpeg() is True
+    
+    @patch('m4b_tools.utils._resolved_binaries', {})
+    @patch('m4b_tools.utils.shutil.which')
+    def test_resolve_binary_retries_misses(self, mock_which):
+        """Test that a binary missing from PATH is looked up again on the next call."""
+        mock_which.return_value = None
+        assert resolve_binary('ffmpeg') == 'ffmpeg'
+        
+        mock_which.return_value = '/usr/bin/ffmpeg'
+        assert resolve_binary('ffmpeg') == '/usr/bin/ffmpeg'
+        assert resolve_binary('ffmpeg') == '/usr/bin/ffmpeg'
+        assert mock_which.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_select_aac_encoder(self, mock_run):
+        """Test AAC encoder selection from the FFmpeg encoder list."""
+        mock_result = MagicMock()
+        mock_result.stdout = (
+            "Encoders:\n"
+            " A..... = Audio\n"
+            " ------\n"
+            " A....D aac                  AAC (Advanced Audio Coding)\n"
+            " A....D libfdk_aac           Fraunhofer FDK AAC (codec aac)\n"
+        )
+        mock_run.return_value = mock_result
+        get_ffmpeg_encoders.cache_clear()
+        try:
+            assert select_aac_encoder() == 'aac'
+            assert select_aac_encoder(hwaccel=True) == 'libfdk_aac'
+            assert 'aac' in get_ffmpeg_encoders()
+        finally:
+            get_ffmpeg_encoders.cache_clear()
     
     def test_natural_sort_key(self):
         """Test natural sorting key function."""
@@ -59,6 +100,70 @@ class TestUtils:
         assert metadata['codec'] == "aac"
         assert metadata['channels'] == 2
     
+    @patch('subprocess.run')
+    @patch('m4b_tools.utils.MP4')
+    def test_get_audio_metadata_from_mp4_atoms(self, mock_mp4, mock_run):
+        """Test that M4B metadata is read in-process when mutagen is available."""
+        audio = MagicMock()
+        audio.tags = {'\xa9nam': ['Test'], '\xa9day': ['2020-01-01']}
+        audio.info.length = 123.45
+        audio.info.codec = 'mp4a.40.2'
+        audio.info.bitrate = 64000
+        audio.info.sample_rate = 44100
+        audio.info.channels = 2
+        mock_mp4.return_value = audio
+        
+        metadata = get_audio_metadata("test.m4b")
+        assert metadata['duration'] == 123.45
+        assert metadata['title'] == "Test"
+        assert metadata['year'] == "2020"
+        assert metadata['codec'] == "aac"
+        assert metadata['sample_rate'] == "44100"
+        mock_run.assert_not_called()
+    
+    @pytest.mark.parametrize("probe", [get_audio_metadata, get_audio_stream_info])
+    @patch('subprocess.run')
+    def test_get_audio_metadata_cached(self, mock_run, probe):
+        """Test that repeat probes of an unchanged file are served from cache."""
+        mock_result = MagicMock()
+        mock_result.stdout = '{"format": {"duration": "1.5"}, "streams": []}'
+        mock_run.return_value = mock_result
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_file = Path(temp_dir) / "cached.mp3"
+            audio_file.write_bytes(b"a")
+            
+            first = probe(str(audio_file))
+            first['duration'] = 0
+            assert probe(str(audio_file))['duration'] == 1.5
+            assert mock_run.call_count == 1
+            
+            # Any change to the file invalidates the entry
+            audio_file.write_bytes(b"ab")
+            probe(str(audio_file))
+            assert mock_run.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_get_audio_stream_info(self, mock_run):
+        """Test the trimmed duration/stream probe."""
+        mock_result = MagicMock()
+        mock_result.stdout = '{"streams": [{"codec_name": "mp3", "sample_rate": "44100", "channels": 1}], "format": {"duration": "12.5"}}'
+        mock_run.return_value = mock_result
+        
+        metadata = get_audio_stream_info("test.mp3")
+        assert metadata['duration'] == 12.5
+        assert metadata['codec'] == "mp3"
+        assert metadata['channels'] == 1
+        assert metadata['title'] == ""
+        assert '-select_streams' in mock_run.call_args[0][0]
+    
+    def test_load_ffprobe_json(self):
+        """Test parsing raw ffprobe output with and without orjson."""
+        output = b'{"format": {"duration": "1.5"}}'
+        assert load_ffprobe_json(output) == {'format': {'duration': '1.5'}}
+        with patch('m4b_tools.utils.orjson', None):
+            assert load_ffprobe_json(output) == {'format': {'duration': '1.5'}}
+    
     @patch('subprocess.run')
     def test_get_audio_metadata_failure(self, mock_run):
         """Test getting audio metadata when it fails."""
@@ -85,6 +190,26 @@ class TestUtils:
         duration = get_audio_duration("nonexistent.m4b")
         assert duration is None
     
+    @pytest.mark.parametrize("probe,failed,stdout,expected", [
+        (get_audio_metadata, {}, '{"format": {"duration": "1.5"}, "streams": []}', 1.5),
+        (get_audio_stream_info, {}, '{"format": {"duration": "1.5"}, "streams": []}', 1.5),
+        (get_audio_duration, None, "1.5\n", 1.5),
+    ])
+    @patch('subprocess.run')
+    def test_failed_probe_not_cached(self, mock_run, probe, failed, stdout, expected):
+        """Test that a failed probe is retried rather than served from cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            audio_file = Path(temp_dir) / "failing.mp3"
+            audio_file.write_bytes(b"a")
+            
+            mock_run.side_effect = subprocess.CalledProcessError(1, 'ffprobe')
+            assert probe(str(audio_file)) == failed
+            
+            mock_run.side_effect = None
+            mock_run.return_value = MagicMock(stdout=stdout)
+            result = probe(str(audio_file))
+            assert (result['duration'] if isinstance(result, dict) else result) == expected
+    
     def test_ensure_output_directory(self):
         """Test ensuring output directory exists."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -108,4 +233,38 @@ class TestUtils:
             assert os.path.exists(os.path.dirname(test_file))
             
             # Should not raise an error
-            ensure_output_directory(test_file)
\ No newline at end of file
+            ensure_output_directory(test_file)
+    
+    def test_drop_page_cache(self):
+        """Test that dropping the page cache is harmless for any path."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "output.m4b")
+            Path(file_path).write_bytes(b"data")
+            drop_page_cache(file_path)
+            assert Path(file_path).read_bytes() == b"data"
+            
+            # Missing files are ignored
+            drop_page_cache(os.path.join(temp_dir, "missing.m4b"))
+    
+    def test_iter_matching_files(self):
+        """Test that only regular files with a wanted extension are matched."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.makedirs(os.path.join(temp_dir, "folder.m4b"))
+            for name in ["a.m4b", "b.M4A", "c.mp3"]:
+                Path(temp_dir, name).touch()
+            
+            matches = iter_matching_files(os.path.join(temp_dir, "*"), {'.m4b', '.m4a'})
+            assert sorted(matches) == [os.path.join(temp_dir, "a.m4b"), os.path.join(temp_dir, "b.M4A")]
+    
+    def test_prefetch_files(self):
+        """Test that prefetching ignores missing files and skips files too large for memory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "input.m4b")
+            Path(file_path).write_bytes(b"data")
+            missing_path = os.path.join(temp_dir, "missing.m4b")
+            
+            with patch('m4b_tools.utils._available_memory', return_value=1 << 30):
+                assert prefetch_files([file_path, missing_path]) == hasattr(os, 'posix_fadvise')
+            with patch('m4b_tools.utils._available_memory', return_value=2):
+                assert prefetch_files([file_path]) is False
+            assert Path(file_path).read_bytes() == b"data"